@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import json
 from pathlib import Path
 from typing import Optional
 
@@ -11,8 +10,8 @@ import typer
 from ace_playbook.config import ACEConfig
 from ace_playbook.pipeline_offline import CSVQAAdapter, OfflinePipeline
 from ace_playbook.playbook import Playbook
-from ace_playbook.storage import dump_playbook
-from ace_playbook.utils import render_bullets_table
+from ace_playbook.storage import dump_playbook, dump_playbook_jsonl
+from ace_playbook.utils import json_dumps_pretty, render_bullets_table
 
 app = typer.Typer(help="Offline ACE operations")
 
@@ -29,8 +28,7 @@ def train(
     playbook = Playbook.initialize(config)
     adapter = CSVQAAdapter(data_path)
     pipeline = OfflinePipeline(config, playbook)
-    tasks = list(adapter.iter_tasks())
-    pipeline.train(tasks, epochs=epochs)
+    pipeline.train(adapter.iter_tasks, epochs=epochs)
     typer.echo("Training complete.")
 
 
@@ -45,13 +43,19 @@ def inspect(storage_path: Path = typer.Argument(..., exists=True)) -> None:
 @app.command()
 def export(
     storage_path: Path = typer.Argument(..., exists=True),
-    output_path: Path = typer.Option(Path("playbook.json")),
+    output_path: Path = typer.Option(
+        Path("playbook.json"), help="A .jsonl path streams one bullet per line."
+    ),
 ) -> None:
     config = ACEConfig.from_env(storage_path=storage_path)
     playbook = Playbook.initialize(config)
-    bullets = dump_playbook(playbook.storage)
-    output_path.write_text(json.dumps(bullets, indent=2, ensure_ascii=False), encoding="utf-8")
-    typer.echo(f"Exported {len(bullets)} bullets to {output_path}")
+    if output_path.suffix == ".jsonl":
+        count = dump_playbook_jsonl(playbook.storage, output_path)
+    else:
+        bullets = list(dump_playbook(playbook.storage))
+        output_path.write_bytes(json_dumps_pretty(bullets))
+        count = len(bullets)
+    typer.echo(f"Exported {count} bullets to {output_path}")
 
 
 if __name__ == "__main__":
@@ -3,11 +3,19 @@
 from __future__ import annotations
 
 import csv
+from itertools import islice
 from pathlib import Path
 from typing import Optional
 
 import typer
 
+try:  # pragma: no cover - optional dependency
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+except ImportError:  # pragma: no cover
+    pa = None
+    pa_csv = None
+
 from ace_playbook.config import ACEConfig
 from ace_playbook.pipeline_online import Episode, OnlinePipeline
 from ace_playbook.playbook import Playbook
@@ -16,10 +24,28 @@ app = typer.Typer(help="Online ACE operations")
 
 
 def _load_episodes(path: Path):
-    with path.open("r", encoding="utf-8") as fh:
-        reader = csv.DictReader(fh)
-        for row in reader:
-            yield Episode(query=row.get("question", ""), answer=row.get("answer"))
+    if pa_csv is None:
+        with path.open("r", encoding="utf-8") as fh:
+            reader = csv.DictReader(fh)
+            for row in reader:
+                yield Episode(query=row.get("question", ""), answer=row.get("answer"))
+        return
+    reader = pa_csv.open_csv(
+        path,
+        read_options=pa_csv.ReadOptions(block_size=1 << 20),
+        # Only the two used columns are converted, so other columns cannot fail
+        # type inference; missing ones come back as nulls.
+        convert_options=pa_csv.ConvertOptions(
+            column_types={"question": pa.string(), "answer": pa.string()},
+            include_columns=["question", "answer"],
+            include_missing_columns=True,
+        ),
+    )
+    for batch in reader:
+        queries = batch.column("question").to_pylist()
+        answers = batch.column("answer").to_pylist()
+        for query, answer in zip(queries, answers, strict=True):
+            yield Episode(query=query if query is not None else "", answer=answer)
 
 
 @app.command()
@@ -27,19 +53,22 @@ def rollout(
     data_path: Path = typer.Argument(..., exists=True),
     storage_path: Optional[Path] = typer.Option(None, help="Existing playbook DB"),
     episodes: int = typer.Option(10, help="Number of episodes to run"),
+    batch_size: int = typer.Option(
+        1, help="Episodes whose contexts are retrieved together (>1 hides their updates)"
+    ),
+    workers: int = typer.Option(
+        1, help="Episodes of a batch run concurrently (merges land in completion order)"
+    ),
 ) -> None:
     config = ACEConfig.from_env()
     if storage_path:
         config = config.copy(update={"storage_path": storage_path})
     playbook = Playbook.initialize(config)
     pipeline = OnlinePipeline(config, playbook)
-    traces = []
-    for idx, episode in enumerate(_load_episodes(data_path)):
-        if idx >= episodes:
-            break
-        trace = next(iter(pipeline.run([episode])))
-        traces.append(trace)
-    typer.echo(f"Completed {len(traces)} episodes")
+    selected = list(islice(_load_episodes(data_path), episodes))
+    for _ in pipeline.run(selected, batch_size=batch_size, max_workers=workers):
+        pass
+    typer.echo(f"Completed {len(selected)} episodes")
 
 
 if __name__ == "__main__":
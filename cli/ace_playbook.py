@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import json
 from pathlib import Path
 from typing import Optional
 
@@ -10,7 +9,7 @@ import typer
 
 from ace_playbook.config import ACEConfig
 from ace_playbook.playbook import Playbook
-from ace_playbook.schemas import DeltaSchema
+from ace_playbook.schemas import parse_delta
 
 app = typer.Typer(help="Playbook utilities")
 
@@ -28,8 +27,7 @@ def retrieve(query: str, storage_path: Optional[Path] = typer.Option(None)) -> N
 
 @app.command()
 def merge(delta_path: Path, storage_path: Optional[Path] = typer.Option(None)) -> None:
-    payload = json.loads(delta_path.read_text(encoding="utf-8"))
-    delta = DeltaSchema.model_validate(payload).to_runtime()
+    delta = parse_delta(delta_path.read_bytes())
     config = ACEConfig.from_env()
     if storage_path:
         config = config.copy(update={"storage_path": storage_path})
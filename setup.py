@@ -0,0 +1,31 @@
+"""Optional compiled build.
+
+Packaging metadata lives in ``pyproject.toml``. Set ``ACE_BUILD_CYTHON=1`` (with
+Cython installed) to compile the per-bullet hot paths (``ace_playbook.schemas`` and
+``ace_playbook.sanitize``) as extension modules; the pure-Python modules are used
+otherwise. ``ace_playbook._kernels`` is never compiled: numba needs its bytecode.
+"""
+
+from __future__ import annotations
+
+import os
+import warnings
+
+from setuptools import setup
+
+
+def _ext_modules() -> list:
+    if os.environ.get("ACE_BUILD_CYTHON", "").lower() not in {"1", "true", "yes"}:
+        return []
+    try:
+        from Cython.Build import cythonize
+    except ImportError:
+        warnings.warn("ACE_BUILD_CYTHON is set but Cython is not installed; building pure Python")
+        return []
+    return cythonize(
+        ["src/ace_playbook/schemas.py", "src/ace_playbook/sanitize.py"],
+        compiler_directives={"language_level": 3, "binding": True},
+    )
+
+
+setup(ext_modules=_ext_modules())
@@ -0,0 +1,40 @@
+"""Optional numba kernels.
+
+Kept out of the Cython build: numba compiles from Python bytecode, which functions
+in a cythonized module do not have.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+try:  # pragma: no cover - optional dependency
+    from numba import njit
+except ImportError:  # pragma: no cover
+    njit = None
+
+HAVE_NUMBA = njit is not None
+
+
+def cosine_kernel(a: np.ndarray, b: np.ndarray) -> float:
+    dot = 0.0
+    norm_a = 0.0
+    norm_b = 0.0
+    for i in range(a.shape[0]):
+        x = a[i]
+        y = b[i]
+        dot += x * y
+        norm_a += x * x
+        norm_b += y * y
+    denom = norm_a * norm_b
+    if denom == 0.0:
+        return 0.0
+    return dot / np.sqrt(denom)
+
+
+if njit is not None:
+    # An explicit signature compiles eagerly at import and rejects any input that
+    # would otherwise trigger a silent respecialisation; callers coerce to float32.
+    cosine_kernel = njit("float64(float32[::1], float32[::1])", cache=True, fastmath=True)(
+        cosine_kernel
+    )
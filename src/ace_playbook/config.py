@@ -4,8 +4,9 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass, fields
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, ClassVar, Dict, Literal, Optional
+from typing import Any, Callable, ClassVar, Dict, Literal, Optional, Tuple, get_type_hints
 
 
 @dataclass
@@ -15,6 +16,13 @@ class ACEConfig:
     top_p: float = 1.0
     max_tokens: int = 1024
     request_timeout: float = 120.0
+    retry_max_attempts: int = 3
+    pool_max_connections: int = 100
+    pool_max_keepalive: int = 20
+    pool_keepalive_expiry: float = 30.0
+    # Opt-in: request bodies larger than this are gzip-compressed. Off (0) by
+    # default because many OpenAI-compatible servers reject gzip request bodies.
+    request_gzip_min_bytes: int = 0
 
     base_url: str = "https://api.openai.com/v1"
     api_key_env: str = "OPENAI_API_KEY"
@@ -23,6 +31,11 @@ class ACEConfig:
     embedding_base_url: Optional[str] = None
     embedding_api_key_env: Optional[str] = None
     local_embedding_model: str = "all-MiniLM-L6-v2"
+    embedding_batch_size: int = 64
+    embedding_batch_window_ms: float = 10.0
+    # Large embedding inputs are split into batches posted this many at a time.
+    embedding_max_concurrency: int = 4
+    embedding_jitter_ms: float = 20.0
 
     retrieval_top_k: int = 8
     retrieval_alpha: float = 0.7
@@ -31,6 +44,8 @@ class ACEConfig:
     retrieval_freshness: float = 0.1
 
     dedup_cosine_threshold: float = 0.86
+    # "int8" keeps the in-memory embedding cache quantized (4x smaller, slightly lossy).
+    embedding_quantization: Literal["none", "int8"] = "none"
     grow_and_refine: Literal["proactive", "lazy"] = "proactive"
     refine_window_size: int = 50
 
@@ -38,6 +53,8 @@ class ACEConfig:
     trace_dir: Path = Path("traces")
 
     n_reflect_iterations: int = 1
+    # >1 overlaps LLM calls across tasks but lets merges land in completion order.
+    pipeline_max_concurrency: int = 1
     random_seed: int = 42
 
     ENV_PREFIX: ClassVar[str] = "ACE_"
@@ -47,13 +64,7 @@ class ACEConfig:
 
     @classmethod
     def from_env(cls, **overrides: Any) -> "ACEConfig":
-        values: Dict[str, Any] = {}
-        for field_info in fields(cls):
-            if not field_info.init:
-                continue
-            env_name = f"{cls.ENV_PREFIX}{field_info.name.upper()}"
-            if env_name in os.environ:
-                values[field_info.name] = cls._cast_value(field_info.type, os.environ[env_name])
+        values = dict(_cast_env(tuple(os.environ.get(env) for _, env, _ in _FIELD_CAST_TABLE)))
         values.update(overrides)
         return cls(**values)
 
@@ -69,17 +80,6 @@ class ACEConfig:
         if not 0 < self.top_p <= 1:
             raise ValueError("top_p must be between 0 and 1")
 
-    @staticmethod
-    def _cast_value(field_type: Any, raw: str) -> Any:
-        origin = getattr(field_type, "__origin__", None)
-        if origin is Literal:
-            return raw
-        if field_type in (int, float, str):
-            return field_type(raw)
-        if field_type is Path:
-            return Path(raw)
-        return raw
-
     def api_key(self) -> Optional[str]:
         return os.getenv(self.api_key_env)
 
@@ -91,3 +91,33 @@ class ACEConfig:
         path = Path(self.trace_dir)
         path.mkdir(parents=True, exist_ok=True)
         return path
+
+
+_CASTERS: Dict[Any, Callable[[str], Any]] = {int: int, float: float, str: str, Path: Path}
+
+
+def _caster_for(field_type: Any) -> Callable[[str], Any]:
+    # Literal and Optional[...] fields are kept as the raw string.
+    return _CASTERS.get(field_type, str)
+
+
+# (field name, environment variable, caster) for every init field. Types are
+# resolved once here because ``from __future__ import annotations`` leaves
+# ``Field.type`` as a string.
+_TYPE_HINTS = get_type_hints(ACEConfig)
+_FIELD_CAST_TABLE: Tuple[Tuple[str, str, Callable[[str], Any]], ...] = tuple(
+    (f.name, f"{ACEConfig.ENV_PREFIX}{f.name.upper()}", _caster_for(_TYPE_HINTS[f.name]))
+    for f in fields(ACEConfig)
+    if f.init
+)
+
+
+@lru_cache(maxsize=32)
+def _cast_env(raw_values: Tuple[Optional[str], ...]) -> Dict[str, Any]:
+    """Cast the raw environment values (aligned with ``_FIELD_CAST_TABLE``)."""
+
+    return {
+        name: caster(raw)
+        for (name, _, caster), raw in zip(_FIELD_CAST_TABLE, raw_values)
+        if raw is not None
+    }
@@ -7,9 +7,11 @@ from collections import defaultdict
 from dataclasses import dataclass
 from typing import Dict, Iterable, List, Tuple
 
+import numpy as np
+
 from .config import ACEConfig
 from .embeddings import BaseEmbeddings
-from .schemas import Bullet, BulletPatch, DeltaRuntime, MergeReport, cosine_similarity
+from .schemas import Bullet, BulletPatch, DeltaRuntime, MergeReport, normalize_rows
 from .storage import PlaybookStorage
 
 logger = logging.getLogger(__name__)
@@ -24,15 +26,16 @@ class Curator:
     def merge(self, delta: DeltaRuntime) -> MergeReport:
         logger.info("Merging delta with %d bullets and %d patches", len(delta.bullets), len(delta.patches))
         valid_bullets = self._validate_bullets(delta.bullets)
-        vectors = self.embedder.embed_texts([b.body for b in valid_bullets]).vectors
+        vectors = np.asarray(
+            self.embedder.embed_texts([b.body for b in valid_bullets]).vectors, dtype=np.float32
+        )
         for bullet, vector in zip(valid_bullets, vectors):
             bullet.embedding = vector
         deduplicated = self._deduplicate(valid_bullets)
         added, updated = self.storage.upsert_bullets(deduplicated)
         updated += self._apply_patches(delta.patches)
         if delta.traces:
-            for trace in delta.traces:
-                self.storage.record_trace(trace)
+            self.storage.record_traces(delta.traces)
         skipped = len(delta.bullets) - len(valid_bullets)
         if self.config.grow_and_refine == "proactive":
             self._prune_if_needed()
@@ -44,9 +47,9 @@ class Curator:
         for bullet in bullets:
             try:
                 if isinstance(bullet, Bullet):
-                    bullet = Bullet.from_dict(bullet.to_dict())
+                    bullet.validate()
                 else:
-                    bullet = Bullet.from_dict(dict(bullet))  # type: ignore[arg-type]
+                    bullet = Bullet.from_dict(bullet)  # type: ignore[arg-type]
             except Exception as exc:  # noqa: BLE001
                 logger.warning("Skipping invalid bullet: %s", exc)
                 continue
@@ -61,65 +64,97 @@ class Curator:
     def _deduplicate(self, bullets: List[Bullet]) -> List[Bullet]:
         if not bullets:
             return []
+        threshold = self.config.dedup_cosine_threshold
+        embedded = [idx for idx, bullet in enumerate(bullets) if bullet.embedding is not None]
+        if not embedded:
+            return list(bullets)
+        row_of = {idx: row for row, idx in enumerate(embedded)}
+        incoming = normalize_rows([bullets[idx].embedding for idx in embedded])
+
+        is_duplicate = np.zeros(len(embedded), dtype=bool)
+        stored_dim = self.storage.embedding_dim
+        stored_ids: List[str] = []
+        if stored_dim == incoming.shape[1]:
+            stored_ids, sims = self.storage.embedding_similarities(incoming)
+        if stored_ids:
+            is_duplicate = sims.max(axis=1) >= threshold
+            nearest = sims.argmax(axis=1)
+            for row in np.flatnonzero(is_duplicate):
+                logger.info(
+                    "Rejected bullet %s as duplicate of %s (cosine >= %.2f)",
+                    bullets[embedded[row]].title,
+                    stored_ids[nearest[row]],
+                    threshold,
+                )
+        elif stored_dim and stored_dim != incoming.shape[1]:
+            logger.warning(
+                "Skipping stored dedup: embedding dim %d does not match playbook dim %d",
+                incoming.shape[1],
+                stored_dim,
+            )
+        rejected = {embedded[row] for row in np.flatnonzero(is_duplicate)}
+        survivors = [idx for idx in range(len(bullets)) if idx not in rejected]
+        if not survivors:
+            return []
+        survivor_rows = [row_of[idx] for idx in survivors if idx in row_of]
+        gram_pos = {row: pos for pos, row in enumerate(survivor_rows)}
+        gram = incoming[survivor_rows] @ incoming[survivor_rows].T
+
         keep: List[Bullet] = []
-        existing_bullets, existing_vectors = self.storage.fetch_embeddings()
-        for bullet in bullets:
-            duplicate_found = False
-            if bullet.embedding:
-                for stored_bullet, stored_vector in zip(existing_bullets, existing_vectors):
-                    if cosine_similarity(stored_vector, bullet.embedding) >= self.config.dedup_cosine_threshold:
-                        duplicate_found = True
-                        logger.info(
-                            "Rejected bullet %s as duplicate of %s (cosine >= %.2f)",
-                            bullet.title,
-                            stored_bullet.id,
-                            self.config.dedup_cosine_threshold,
-                        )
-                        break
-            if not duplicate_found:
-                for existing in keep:
-                    if not existing.embedding or not bullet.embedding:
-                        continue
-                    if cosine_similarity(existing.embedding, bullet.embedding) >= self.config.dedup_cosine_threshold:
-                        duplicate_found = True
-                        existing.helpful_count += bullet.helpful_count
-                        existing.tags = sorted(set(existing.tags) | set(bullet.tags))
-                        existing.source_trace_ids = list(set(existing.source_trace_ids + bullet.source_trace_ids))
-                        logger.info(
-                            "Merged duplicate incoming bullet %s into %s",
-                            bullet.title,
-                            existing.id,
-                        )
-                        break
-            if not duplicate_found:
-                keep.append(bullet)
+        kept: List[int] = []
+        for idx in survivors:
+            bullet = bullets[idx]
+            pos = gram_pos.get(row_of.get(idx, -1))
+            if pos is not None and kept:
+                hits = np.flatnonzero(gram[pos, kept] >= threshold)
+                if hits.size:
+                    existing = bullets[embedded[survivor_rows[kept[hits[0]]]]]
+                    existing.helpful_count += bullet.helpful_count
+                    existing.tags = sorted(set(existing.tags) | set(bullet.tags))
+                    existing.source_trace_ids = list(set(existing.source_trace_ids + bullet.source_trace_ids))
+                    logger.info(
+                        "Merged duplicate incoming bullet %s into %s",
+                        bullet.title,
+                        existing.id,
+                    )
+                    continue
+            keep.append(bullet)
+            if pos is not None:
+                kept.append(pos)
         return keep
 
     def _apply_patches(self, patches: Iterable[BulletPatch]) -> int:
-        updated_bullets: List[Bullet] = []
+        patches = list(patches)
+        if not patches:
+            return 0
+        stored = self.storage.get_bullets(patch.bullet_id for patch in patches)
+        # Counter ops become increments applied in SQL; only bodies are read-modify-write.
+        counts: Dict[str, List[int]] = {}
+        bodies: Dict[str, str] = {}
         for patch in patches:
-            bullet = self.storage.get_bullet(patch.bullet_id)
+            bullet = stored.get(patch.bullet_id)
             if bullet is None:
                 continue
+            delta = counts.setdefault(bullet.id, [0, 0])
             if patch.op == "inc_helpful":
-                bullet.helpful_count += 1
+                delta[0] += 1
             elif patch.op == "inc_harmful":
-                bullet.harmful_count += 1
+                delta[1] += 1
             elif patch.op == "patch" and patch.patch_text:
                 if patch.patch_mode == "append":
-                    bullet.body = f"{bullet.body}\n{patch.patch_text}".strip()
+                    body = bodies.get(bullet.id, bullet.body)
+                    bodies[bullet.id] = f"{body}\n{patch.patch_text}".strip()
                 else:
-                    bullet.body = patch.patch_text
-            updated_bullets.append(bullet)
-        if updated_bullets:
-            self.storage.upsert_bullets(updated_bullets)
-        return len(updated_bullets)
+                    bodies[bullet.id] = patch.patch_text
+        self.storage.patch_bullets(
+            {bullet_id: (h, m) for bullet_id, (h, m) in counts.items() if h or m}, bodies
+        )
+        return len(counts)
 
     def _prune_if_needed(self) -> None:
-        bullets = self.storage.list_bullets()
-        if len(bullets) <= self.config.refine_window_size:
+        window = self.config.refine_window_size
+        # One extra id tells us whether the playbook exceeds the window at all.
+        keep_ids = self.storage.top_bullet_ids(window + 1)
+        if len(keep_ids) <= window:
             return
-        bullets.sort(key=lambda b: (b.helpful_count - b.harmful_count, b.created_at), reverse=True)
-        to_keep = bullets[: self.config.refine_window_size]
-        keep_ids = {b.id for b in to_keep}
-        self.storage.prune_to_ids(list(keep_ids))
+        self.storage.prune_to_ids(keep_ids[:window])
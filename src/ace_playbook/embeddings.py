@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+import hashlib
 import logging
+import os
 from dataclasses import dataclass
-from random import Random
-from typing import Iterable, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
 
 from .config import ACEConfig
 from .llm_client import SyncChatClient
@@ -13,13 +16,40 @@ from .llm_client import SyncChatClient
 logger = logging.getLogger(__name__)
 
 
+# SplitMix64 constants (Steele et al.); used to expand a per-text seed into a vector.
+_SPLITMIX_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+_SPLITMIX_M1 = np.uint64(0xBF58476D1CE4E5B9)
+_SPLITMIX_M2 = np.uint64(0x94D049BB133111EB)
+
+
+def _hash_vectors(texts: List[str], dim: int) -> np.ndarray:
+    """Deterministic pseudo-random ``(len(texts), dim)`` float32 vectors in ``[-1, 1)``.
+
+    Each text is seeded from a blake2b digest (stable across processes, unlike
+    ``hash()``) and every dimension of the batch is generated in one numpy pass.
+    """
+
+    digests = b"".join(
+        hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest() for text in texts
+    )
+    seeds = np.frombuffer(digests, dtype="<u8").astype(np.uint64)
+    steps = np.arange(1, dim + 1, dtype=np.uint64) * _SPLITMIX_GAMMA
+    z = seeds[:, None] + steps  # uint64 arithmetic wraps, as SplitMix64 expects
+    z = (z ^ (z >> np.uint64(30))) * _SPLITMIX_M1
+    z = (z ^ (z >> np.uint64(27))) * _SPLITMIX_M2
+    z ^= z >> np.uint64(31)
+    # Top 53 bits -> uniform [0, 1) -> [-1, 1).
+    unit = (z >> np.uint64(11)).astype(np.float64) * (2.0**-53)
+    return (unit * 2.0 - 1.0).astype(np.float32)
+
+
 class EmbeddingError(RuntimeError):
     """Raised when embedding generation fails."""
 
 
 @dataclass
 class EmbeddingResult:
-    vectors: List[List[float]]
+    vectors: Union[np.ndarray, List[List[float]]]
     model: str
 
 
@@ -33,20 +63,24 @@ class OpenAIEmbeddings(BaseEmbeddings):
 
     def __init__(self, config: ACEConfig):
         self._config = config
+        self._client = SyncChatClient(config)
 
     def embed_texts(self, texts: Iterable[str]) -> EmbeddingResult:
         payload = list(texts)
         if not payload:
             return EmbeddingResult([], self._config.embedding_model)
 
-        client = SyncChatClient(self._config)
+        kwargs = {
+            "model": self._config.embedding_model,
+            "base_url": self._config.embedding_base_url,
+            "api_key": self._config.embedding_api_key(),
+        }
         try:
-            vectors = client.embeddings(
-                payload,
-                model=self._config.embedding_model,
-                base_url=self._config.embedding_base_url,
-                api_key=self._config.embedding_api_key(),
-            )
+            if len(payload) == 1:
+                # Single queries (one per episode) from worker threads are coalesced.
+                vectors = [self._client.embed_one(payload[0], **kwargs)]
+            else:
+                vectors = self._client.embeddings(payload, **kwargs)
         except Exception as exc:  # noqa: BLE001
             raise EmbeddingError(str(exc)) from exc
         return EmbeddingResult([list(map(float, vec)) for vec in vectors], self._config.embedding_model)
@@ -55,7 +89,8 @@ class OpenAIEmbeddings(BaseEmbeddings):
 class LocalEmbeddings(BaseEmbeddings):
     """Fallback embeddings based on sentence-transformers."""
 
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2", batch_size: int = 64):
+        self._batch_size = batch_size
         try:
             from sentence_transformers import SentenceTransformer
         except Exception as exc:  # noqa: BLE001
@@ -77,24 +112,43 @@ class LocalEmbeddings(BaseEmbeddings):
         if not payload:
             return EmbeddingResult([], "local")
         if self._model is None:
-            vectors = [self._hash_vector(text) for text in payload]
+            vectors = _hash_vectors(payload, self._dim)
             return EmbeddingResult(vectors, "hash")
-        vectors = self._model.encode(payload, convert_to_numpy=False)
-        return EmbeddingResult([list(map(float, vec)) for vec in vectors], self._model.__class__.__name__)
+        vectors = self._model.encode(
+            payload,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            batch_size=self._batch_size,
+            show_progress_bar=False,
+        )
+        return EmbeddingResult(vectors, self._model.__class__.__name__)
+
+
+# Endpoints whose credentials already passed the health check in this process.
+_HEALTH_CACHE: Dict[Tuple[Optional[str], str, Optional[str]], bool] = {}
 
-    def _hash_vector(self, text: str) -> List[float]:
-        seed = abs(hash(text)) % (2**32)
-        random = Random(seed)
-        return [random.uniform(-1.0, 1.0) for _ in range(self._dim)]
+
+def _health_key(config: ACEConfig) -> Tuple[Optional[str], str, Optional[str]]:
+    return (
+        config.embedding_base_url or config.base_url,
+        config.embedding_model,
+        config.embedding_api_key_env or config.api_key_env,
+    )
 
 
 def build_embedding_provider(config: ACEConfig) -> BaseEmbeddings:
-    """Construct an embedding provider with graceful fallback."""
+    """Construct an embedding provider with graceful fallback.
+
+    Set ``ACE_SKIP_EMBED_HEALTHCHECK=1`` to skip the credential dry run.
+    """
 
     try:
         provider: BaseEmbeddings = OpenAIEmbeddings(config)
-        # Attempt a quick dry run to ensure the credentials work.
-        provider.embed_texts(["ace health check"])
+        key = _health_key(config)
+        if not _HEALTH_CACHE.get(key) and os.environ.get("ACE_SKIP_EMBED_HEALTHCHECK") != "1":
+            # Attempt a quick dry run to ensure the credentials work.
+            provider.embed_texts(["ace health check"])
+            _HEALTH_CACHE[key] = True
         logger.info("Using OpenAI embeddings with model %s", config.embedding_model)
         return provider
     except EmbeddingError as exc:
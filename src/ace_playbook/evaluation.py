@@ -3,17 +3,20 @@
 from __future__ import annotations
 
 import json
+import re
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from statistics import mean
+from typing import Any, Dict, Iterable, Optional
 
 try:  # pragma: no cover - optional dependency
     import jsonschema
 except ImportError:  # pragma: no cover
     jsonschema = None  # type: ignore[assignment]
-from statistics import mean
-from typing import Iterable
 
 from .schemas import Trace
+from .utils import json_loads
+
+_WHITESPACE_RE = re.compile(r"\s+")
 
 
 @dataclass
@@ -44,8 +47,8 @@ class NormalizedStringEvaluator(BaseEvaluator):
         return self._normalize(expected) == self._normalize(actual)
 
     @staticmethod
-    def _normalize(text: str) -> str:
-        return " ".join(text.strip().lower().split())
+    def _normalize(text: str, _sub=_WHITESPACE_RE.sub) -> str:
+        return _sub(" ", text.strip().casefold())
 
 
 class NumericToleranceEvaluator(BaseEvaluator):
@@ -112,7 +115,7 @@ def compute_accuracy(traces: Iterable[Trace]) -> EvaluationResult:
     for trace in traces:
         usage_data = trace.metadata.get("usage", "{}")
         try:
-            payload = json.loads(usage_data)
+            payload = json_loads(usage_data)
         except Exception:  # noqa: BLE001
             payload = {}
         total_tokens = payload.get("total_tokens", 0)
@@ -123,3 +126,15 @@ def compute_accuracy(traces: Iterable[Trace]) -> EvaluationResult:
         average_tokens=avg_tokens,
         total_traces=len(traces),
     )
+
+
+__all__ = [
+    "BaseEvaluator",
+    "EvaluationResult",
+    "ExactMatchEvaluator",
+    "JSONSchemaEvaluator",
+    "NormalizedStringEvaluator",
+    "NumericToleranceEvaluator",
+    "compute_accuracy",
+    "get_evaluator",
+]
@@ -10,7 +10,7 @@ from .config import ACEConfig
 from .llm_client import SyncChatClient
 from .schemas import ContextSlice, Trace
 from .storage import PlaybookStorage
-from .utils import load_prompt_template
+from .utils import json_dumps, json_loads, load_prompt_template
 
 logger = logging.getLogger(__name__)
 
@@ -22,18 +22,19 @@ class Generator:
         self.client = SyncChatClient(config)
         self.system_prompt = load_prompt_template("generator_system.txt")
 
-    def run(self, query: str, context: ContextSlice) -> Trace:
+    def run(self, query: str, context: ContextSlice, record: bool = True) -> Trace:
+        """Answer ``query``; with ``record=False`` the caller persists the trace itself."""
+
         logger.info("Generator handling query: %s", query)
         messages = [
             {"role": "system", "content": self.system_prompt},
             {
                 "role": "user",
-                "content": json.dumps(
+                "content": json_dumps(
                     {
                         "query": query,
                         "bullets": [bullet.to_dict() for bullet in context.bullets],
-                    },
-                    ensure_ascii=False,
+                    }
                 ),
             },
         ]
@@ -46,21 +47,22 @@ class Generator:
             used_bullet_ids=parsed["used_bullet_ids"],
             misleading_bullet_ids=parsed["misleading_bullet_ids"],
             attribution_notes=parsed["attribution_notes"],
-            prompt=json.dumps(messages, ensure_ascii=False),
+            prompt=json_dumps(messages),
             response=parsed["answer"],
             success=False,
             metadata={
                 "model": self.config.model,
-                "usage": json.dumps(response.get("usage", {})),
+                "usage": json_dumps(response.get("usage", {})),
                 "raw_response": output,
             },
         )
-        self.storage.record_trace(trace)
+        if record:
+            self.storage.record_trace(trace)
         return trace
 
     def _parse_output(self, output: str) -> Dict[str, object]:
         try:
-            payload = json.loads(output)
+            payload = json_loads(output)
         except json.JSONDecodeError:
             logger.warning("Generator output not JSON, falling back to plain response.")
             return {
@@ -71,7 +73,7 @@ class Generator:
             }
         answer = payload.get("answer", "")
         return {
-            "answer": answer if isinstance(answer, str) else json.dumps(answer, ensure_ascii=False),
+            "answer": answer if isinstance(answer, str) else json_dumps(answer),
             "used_bullet_ids": list(payload.get("used_bullet_ids", []) or []),
             "misleading_bullet_ids": list(payload.get("misleading_bullet_ids", []) or []),
             "attribution_notes": dict(payload.get("attribution_notes", {}) or {}),
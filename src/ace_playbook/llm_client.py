@@ -2,8 +2,16 @@
 
 from __future__ import annotations
 
+import asyncio
+import atexit
+import gzip
 import json
-from typing import Any, Dict, Iterable, List, Optional
+import random
+import threading
+from dataclasses import fields
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 try:  # pragma: no cover - optional dependency
     import httpx
@@ -11,7 +19,14 @@ except ImportError:  # pragma: no cover
     httpx = None  # type: ignore[assignment]
 
 try:  # pragma: no cover - optional dependency
-    from tenacity import retry, stop_after_attempt, wait_exponential
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+except ImportError:  # pragma: no cover
+    _HTTP2 = False
+else:  # pragma: no cover
+    _HTTP2 = True
+
+try:  # pragma: no cover - optional dependency
+    from tenacity import retry, wait_random_exponential
 except ImportError:  # pragma: no cover
     def retry(*args, **kwargs):  # type: ignore
         def decorator(func):
@@ -19,28 +34,122 @@ except ImportError:  # pragma: no cover
 
         return decorator
 
-    def stop_after_attempt(*args, **kwargs):  # type: ignore
-        return None
-
-    def wait_exponential(*args, **kwargs):  # type: ignore
+    def wait_random_exponential(*args, **kwargs):  # type: ignore
         return None
 
 from .config import ACEConfig
+from .utils import json_dumps_bytes, json_loads
 
 
 class LLMError(RuntimeError):
     """Raised when an LLM request fails."""
 
 
+class RateLimitError(LLMError):
+    """Raised on HTTP 429; carries the server's ``Retry-After`` delay in seconds."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max((moment - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def _raise_for_status(response: Any, what: str) -> None:
+    if response.status_code == 429:
+        raise RateLimitError(
+            f"{what} rate limited: {response.text}",
+            retry_after=_parse_retry_after(response.headers.get("Retry-After")),
+        )
+    if response.status_code >= 400:
+        raise LLMError(f"{what} failed: {response.status_code} {response.text}")
+
+
+_jitter_wait = wait_random_exponential(multiplier=1, max=10)
+
+
+def _stop_after_configured_attempts(retry_state: Any) -> bool:
+    client = retry_state.args[0]
+    return retry_state.attempt_number >= client.config.retry_max_attempts
+
+
+def _wait_with_retry_after(retry_state: Any) -> float:
+    """Full-jitter exponential backoff, unless the server asked for a specific delay."""
+
+    exc = retry_state.outcome.exception() if retry_state.outcome else None
+    if isinstance(exc, RateLimitError) and exc.retry_after is not None:
+        return exc.retry_after
+    return _jitter_wait(retry_state)
+
+
+_retry_llm_call = retry(
+    reraise=True, stop=_stop_after_configured_attempts, wait=_wait_with_retry_after
+)
+
+
 class ChatClient:
     """Minimal OpenAI-compatible chat client with retry logic."""
 
     def __init__(self, config: ACEConfig):
         self.config = config
+        self._alt_clients: Dict[str, Any] = {}
+        self._batchers: Dict[Tuple[Optional[str], ...], "_BatchedEmbedder"] = {}
+        # Static completion parameters; per-call payloads are one dict merge on top.
+        self._base_payload: Dict[str, Any] = {
+            "model": config.model,
+            "temperature": config.temperature,
+            "top_p": config.top_p,
+            "max_tokens": config.max_tokens,
+        }
         if httpx is None:  # pragma: no cover
             self._client = None
         else:
-            self._client = httpx.AsyncClient(base_url=config.base_url, timeout=config.request_timeout)
+            self._client = self._new_client(config.base_url)
+
+    def _new_client(self, base_url: str) -> "httpx.AsyncClient":
+        limits = httpx.Limits(
+            max_connections=self.config.pool_max_connections,
+            max_keepalive_connections=self.config.pool_max_keepalive,
+            keepalive_expiry=self.config.pool_keepalive_expiry,
+        )
+        return httpx.AsyncClient(
+            base_url=base_url,
+            timeout=self.config.request_timeout,
+            limits=limits,
+            http2=_HTTP2,
+        )
+
+    def _get_client(self, base_url: str) -> "httpx.AsyncClient":
+        """Return a pooled client for ``base_url``, reusing its open connections."""
+
+        if httpx is None:
+            raise LLMError("httpx is required for network operations")
+        client = self._alt_clients.get(base_url)
+        if client is None:
+            client = self._alt_clients[base_url] = self._new_client(base_url)
+        return client
+
+    def _encode_body(self, payload: Dict[str, Any], headers: Dict[str, str]) -> bytes:
+        """Serialize ``payload``, gzip-compressing large bodies (updates ``headers``)."""
+
+        body = json_dumps_bytes(payload)
+        threshold = self.config.request_gzip_min_bytes
+        if threshold > 0 and len(body) > threshold:
+            headers["Content-Encoding"] = "gzip"
+            body = gzip.compress(body, compresslevel=1)
+        return body
 
     async def _request(
         self,
@@ -56,12 +165,12 @@ class ChatClient:
         if key:
             headers["Authorization"] = f"Bearer {key}"
 
-        response = await self._client.request(method, url, json=json_payload, headers=headers)
-        if response.status_code >= 400:
-            raise LLMError(f"LLM request failed: {response.status_code} {response.text}")
-        return response.json()
+        body = self._encode_body(json_payload, headers)
+        response = await self._client.request(method, url, content=body, headers=headers)
+        _raise_for_status(response, "LLM request")
+        return json_loads(response.content)
 
-    @retry(reraise=True, stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=10))
+    @_retry_llm_call
     async def chat(
         self,
         messages: List[Dict[str, str]],
@@ -71,18 +180,9 @@ class ChatClient:
         tool_choice: Optional[str] = None,
         **gen_params: Any,
     ) -> Dict[str, Any]:
-        payload: Dict[str, Any] = {
-            "model": model or self.config.model,
-            "messages": messages,
-        }
-        payload.update(
-            {
-                "temperature": self.config.temperature,
-                "top_p": self.config.top_p,
-                "max_tokens": self.config.max_tokens,
-            }
-        )
-        payload.update(gen_params)
+        payload: Dict[str, Any] = {**self._base_payload, "messages": messages, **gen_params}
+        if model:
+            payload["model"] = model
         if tools is not None:
             payload["tools"] = list(tools)
         if tool_choice is not None:
@@ -90,6 +190,59 @@ class ChatClient:
 
         return await self._request("POST", "/chat/completions", payload)
 
+    @_retry_llm_call
+    async def chat_stream(
+        self,
+        messages: List[Dict[str, str]],
+        *,
+        model: Optional[str] = None,
+        **gen_params: Any,
+    ) -> Dict[str, Any]:
+        """Stream a completion and stop reading once a complete JSON object arrived.
+
+        Returns a response shaped like :meth:`chat` (``choices[0].message.content``).
+        If no balanced object is seen the whole stream is read.
+        """
+
+        if self._client is None:
+            raise LLMError("httpx is required for network operations")
+        payload: Dict[str, Any] = {
+            **self._base_payload, "messages": messages, **gen_params, "stream": True
+        }
+        if model:
+            payload["model"] = model
+        headers = {"Content-Type": "application/json"}
+        key = self.config.api_key()
+        if key:
+            headers["Authorization"] = f"Bearer {key}"
+
+        scanner = _JSONObjectScanner()
+        parts: List[str] = []
+        body = self._encode_body(payload, headers)
+        async with self._client.stream(
+            "POST", "/chat/completions", content=body, headers=headers
+        ) as response:
+            if response.status_code >= 400:
+                await response.aread()
+                _raise_for_status(response, "LLM request")
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                choices = json_loads(data).get("choices") or [{}]
+                chunk = (choices[0].get("delta") or {}).get("content") or ""
+                if not chunk:
+                    continue
+                end = scanner.feed(chunk)
+                if end is not None:
+                    # Leaving the context closes the response and drops the rest.
+                    parts.append(chunk[:end])
+                    break
+                parts.append(chunk)
+        return {"choices": [{"message": {"role": "assistant", "content": "".join(parts)}}]}
+
     async def embeddings(
         self,
         texts: List[str],
@@ -98,20 +251,74 @@ class ChatClient:
         api_key: Optional[str] = None,
         base_url: Optional[str] = None,
     ) -> List[List[float]]:
+        if len(texts) > max(1, self.config.embedding_batch_size):
+            return await self.embed_many(texts, model=model, api_key=api_key, base_url=base_url)
         payload = {"model": model or self.config.embedding_model, "input": texts}
         url = "/embeddings"
         if base_url:
-            if httpx is None:
-                raise LLMError("httpx is required for network operations")
-            async with httpx.AsyncClient(base_url=base_url, timeout=self.config.request_timeout) as client:
-                response = await client.post(url, json=payload, headers=self._build_headers(api_key))
-                if response.status_code >= 400:
-                    raise LLMError(f"Embedding request failed: {response.status_code} {response.text}")
-                data = response.json()
+            client = self._get_client(base_url)
+            headers = self._build_headers(api_key)
+            body = self._encode_body(payload, headers)
+            response = await client.post(url, content=body, headers=headers)
+            _raise_for_status(response, "Embedding request")
+            data = json_loads(response.content)
         else:
             data = await self._request("POST", url, payload, api_key=api_key)
         return [item["embedding"] for item in data.get("data", [])]
 
+    async def embed_one(
+        self,
+        text: str,
+        *,
+        model: Optional[str] = None,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+    ) -> List[float]:
+        """Embed one text, coalescing concurrent calls into batched requests."""
+
+        key = (model, api_key, base_url)
+        batcher = self._batchers.get(key)
+        if batcher is None:
+            batcher = self._batchers[key] = _BatchedEmbedder(
+                self, model=model, api_key=api_key, base_url=base_url
+            )
+        return await batcher.embed(text)
+
+    async def embed_many(
+        self,
+        texts: List[str],
+        *,
+        model: Optional[str] = None,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+    ) -> List[List[float]]:
+        """Embed ``texts`` in ``embedding_batch_size`` slices, several requests in flight.
+
+        At most ``embedding_max_concurrency`` slices are posted at once, each after
+        a random delay of up to ``embedding_jitter_ms`` so a large corpus does not
+        hit the endpoint as one burst. Vectors are returned in input order.
+        """
+
+        batch_size = max(1, self.config.embedding_batch_size)
+        semaphore = asyncio.Semaphore(max(1, self.config.embedding_max_concurrency))
+        jitter = self.config.embedding_jitter_ms / 1000.0
+        results: List[Optional[List[float]]] = [None] * len(texts)
+
+        async def _embed_slice(start: int) -> None:
+            chunk = texts[start : start + batch_size]
+            async with semaphore:
+                if jitter > 0:
+                    await asyncio.sleep(random.uniform(0, jitter))
+                vectors = await self.embeddings(
+                    chunk, model=model, api_key=api_key, base_url=base_url
+                )
+            if len(vectors) != len(chunk):
+                raise LLMError(f"Expected {len(chunk)} embeddings, got {len(vectors)}")
+            results[start : start + len(chunk)] = vectors
+
+        await asyncio.gather(*(_embed_slice(start) for start in range(0, len(texts), batch_size)))
+        return results  # type: ignore[return-value]
+
     def _build_headers(self, api_key: Optional[str]) -> Dict[str, str]:
         headers = {"Content-Type": "application/json"}
         key = api_key or self.config.embedding_api_key()
@@ -120,39 +327,216 @@ class ChatClient:
         return headers
 
     async def aclose(self) -> None:
+        for batcher in self._batchers.values():
+            await batcher.aclose()
+        self._batchers.clear()
         if self._client is not None:
             await self._client.aclose()
+        for client in self._alt_clients.values():
+            await client.aclose()
+        self._alt_clients.clear()
+
+
+class _JSONObjectScanner:
+    """Track brace depth (ignoring braces inside strings) across streamed chunks."""
+
+    def __init__(self) -> None:
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, chunk: str) -> Optional[int]:
+        """Return the offset just past the closing brace of the first object, if reached."""
+
+        for pos, char in enumerate(chunk):
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = self._depth > 0
+            elif char == "{":
+                self._depth += 1
+            elif char == "}" and self._depth:
+                self._depth -= 1
+                if not self._depth:
+                    return pos + 1
+        return None
+
+
+class _BatchedEmbedder:
+    """Coalesce single-text embedding calls into one ``/embeddings`` request.
+
+    Requests are queued and flushed once ``embedding_batch_size`` texts are
+    waiting or ``embedding_batch_window_ms`` has passed since the first one.
+    """
+
+    def __init__(self, client: ChatClient, **embed_kwargs: Any):
+        self._client = client
+        self._embed_kwargs = embed_kwargs
+        self._batch_size = max(1, client.config.embedding_batch_size)
+        self._window = client.config.embedding_batch_window_ms / 1000.0
+        self._queue: Optional[asyncio.Queue] = None
+        self._drainer: Optional[asyncio.Task] = None
+
+    async def embed(self, text: str) -> List[float]:
+        loop = asyncio.get_running_loop()
+        if self._drainer is None or self._drainer.done():
+            self._queue = asyncio.Queue()
+            self._drainer = loop.create_task(self._drain())
+        future: asyncio.Future = loop.create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def _drain(self) -> None:
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+        batch: List[Tuple[str, asyncio.Future]] = []
+        try:
+            while True:
+                batch = [await queue.get()]
+                deadline = loop.time() + self._window
+                while len(batch) < self._batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                await self._flush(batch)
+                batch = []
+        finally:
+            # Cancelled by aclose(): fail the in-flight and queued callers so none hang.
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            _fail_futures(batch, LLMError("Embedding client closed"))
+
+    async def _flush(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        try:
+            vectors = await self._client.embeddings(
+                [text for text, _ in batch], **self._embed_kwargs
+            )
+            if len(vectors) != len(batch):
+                raise LLMError(f"Expected {len(batch)} embeddings, got {len(vectors)}")
+        except Exception as exc:  # noqa: BLE001
+            _fail_futures(batch, exc)
+            return
+        for (_, future), vector in zip(batch, vectors):
+            if not future.done():
+                future.set_result(vector)
+
+    async def aclose(self) -> None:
+        if self._drainer is not None:
+            self._drainer.cancel()
+            try:
+                await self._drainer
+            except (asyncio.CancelledError, RuntimeError):
+                pass
+            self._drainer = None
+
+
+def _fail_futures(batch: List[Tuple[str, asyncio.Future]], exc: BaseException) -> None:
+    for _, future in batch:
+        if not future.done():
+            future.set_exception(exc)
+
+
+class _LoopRunner:
+    """A daemon thread running one event loop shared by every :class:`SyncChatClient`.
+
+    Keeping the loop (and the clients bound to it) alive lets pooled
+    connections survive across synchronous calls. Sync clients built from
+    equal configs (e.g. a pipeline's Generator and Reflector) share one
+    ``ChatClient``.
+    """
+
+    _instance: Optional["_LoopRunner"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self._clients: Dict[Tuple[Any, ...], ChatClient] = {}
+        self._clients_lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self.loop.run_forever, name="ace-llm-loop", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.shutdown)
+
+    @classmethod
+    def get(cls) -> "_LoopRunner":
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def client_for(self, config: ACEConfig) -> ChatClient:
+        key = tuple(getattr(config, f.name) for f in fields(config))
+        with self._clients_lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._clients[key] = ChatClient(config)
+            return client
+
+    def run(self, coro: Any) -> Any:
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def shutdown(self) -> None:
+        if not self.loop.is_running():
+            return
+
+        async def _close() -> None:
+            for client in list(self._clients.values()):
+                await client.aclose()
+
+        try:
+            asyncio.run_coroutine_threadsafe(_close(), self.loop).result(timeout=5)
+        except Exception:  # noqa: BLE001 - best effort at interpreter exit
+            pass
+        self.loop.call_soon_threadsafe(self.loop.stop)
 
 
 class SyncChatClient:
-    """Synchronous wrapper around :class:`ChatClient`."""
+    """Synchronous wrapper around :class:`ChatClient`.
+
+    Calls are dispatched onto a shared background event loop, so the
+    underlying ``ChatClient`` and its connection pool are reused.
+    """
 
     def __init__(self, config: ACEConfig):
         self._config = config
+        self._runner: Optional[_LoopRunner] = None
+        self._async: Optional[ChatClient] = None
 
-    def chat(self, messages: List[Dict[str, str]], **kwargs: Any) -> Dict[str, Any]:
-        import asyncio
+    def _client(self) -> Tuple[_LoopRunner, ChatClient]:
+        if self._async is None:
+            self._runner = _LoopRunner.get()
+            self._async = self._runner.client_for(self._config)
+        return self._runner, self._async
 
-        async def _run() -> Dict[str, Any]:
-            client = ChatClient(self._config)
-            try:
-                return await client.chat(messages, **kwargs)
-            finally:
-                await client.aclose()
+    def chat(
+        self, messages: List[Dict[str, str]], *, stream: bool = False, **kwargs: Any
+    ) -> Dict[str, Any]:
+        """Run a completion; ``stream=True`` stops at the first complete JSON object."""
 
-        return asyncio.run(_run())
+        runner, client = self._client()
+        if stream:
+            return runner.run(client.chat_stream(messages, **kwargs))
+        return runner.run(client.chat(messages, **kwargs))
 
     def embeddings(self, texts: List[str], **kwargs: Any) -> List[List[float]]:
-        import asyncio
+        runner, client = self._client()
+        return runner.run(client.embeddings(texts, **kwargs))
 
-        async def _run() -> List[List[float]]:
-            client = ChatClient(self._config)
-            try:
-                return await client.embeddings(texts, **kwargs)
-            finally:
-                await client.aclose()
+    def embed_one(self, text: str, **kwargs: Any) -> List[float]:
+        """Embed one text; calls from concurrent threads share batched requests."""
 
-        return asyncio.run(_run())
+        runner, client = self._client()
+        return runner.run(client.embed_one(text, **kwargs))
 
 
 def dump_messages(messages: List[Dict[str, str]]) -> str:
@@ -2,14 +2,15 @@
 
 from __future__ import annotations
 
+import asyncio
 import csv
 import logging
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterable, Optional, Sequence
+from typing import Callable, Iterable, List, Optional, Union
 
 from .config import ACEConfig
-from .evaluation import get_evaluator
+from .evaluation import BaseEvaluator, get_evaluator
 from .generator import Generator
 from .playbook import Playbook
 from .reflector import Reflector
@@ -26,9 +27,22 @@ class Task:
     metadata: Optional[dict] = None
     evaluator: str = "exact"
     evaluator_params: dict = field(default_factory=dict)
+    _evaluator: Optional[BaseEvaluator] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
+    def resolve_evaluator(self) -> BaseEvaluator:
+        """Build the evaluator once; it is reused across epochs and reflect iterations."""
 
-def _progress(items: Sequence[Task], desc: str):
+        if self._evaluator is None:
+            self._evaluator = get_evaluator(self.evaluator, self.evaluator_params)
+        return self._evaluator
+
+
+TaskSource = Union[Iterable[Task], Callable[[], Iterable[Task]]]
+
+
+def _progress(items: Iterable[Task], desc: str):
     for item in items:
         yield item
 
@@ -55,6 +69,16 @@ class CSVQAAdapter:
                 )
 
 
+def _task_factory(tasks: TaskSource, epochs: int) -> Callable[[], Iterable[Task]]:
+    if callable(tasks):
+        return tasks
+    if epochs > 1 and iter(tasks) is tasks:
+        # A one-shot iterator cannot be replayed, so buffer it for later epochs.
+        buffered = list(tasks)
+        return lambda: buffered
+    return lambda: tasks
+
+
 @dataclass
 class OfflinePipeline:
     config: ACEConfig
@@ -65,33 +89,87 @@ class OfflinePipeline:
         self.generator = Generator(self.config, self.playbook.storage)
         self.reflector = Reflector(self.config)
 
-    def train(self, tasks: Sequence[Task], epochs: int = 1) -> None:
+    def train(self, tasks: TaskSource, epochs: int = 1) -> None:
+        """Train over ``tasks``; pass a factory (e.g. ``adapter.iter_tasks``) to stream each epoch.
+
+        Inside an already running event loop (e.g. Jupyter), where ``asyncio.run``
+        is unavailable, tasks run sequentially in the calling thread; ``await``
+        :meth:`train_async` there to get concurrency.
+        """
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            asyncio.run(self.train_async(tasks, epochs=epochs))
+        else:
+            self._train_sequential(tasks, epochs)
+
+    def _train_sequential(self, tasks: TaskSource, epochs: int) -> None:
+        factory = _task_factory(tasks, epochs)
         for epoch in range(epochs):
             logger.info("Offline epoch %d/%d", epoch + 1, epochs)
-            for task in _progress(tasks, desc=f"epoch-{epoch+1}"):
-                for iteration in range(self.config.n_reflect_iterations):
-                    context = self.playbook.retrieve(task.query)
-                    trace = self.generator.run(task.query, context)
-                    trace.metadata["expected_answer"] = task.answer or ""
-                    trace.success = self._evaluate(trace, task)
-                    for bullet_id in trace.selected_bullet_ids:
-                        self.playbook.storage.update_usage(bullet_id, trace.success)
-                    delta = self.reflector.reflect([trace], label=task.answer)
+            for task in _progress(factory(), desc=f"epoch-{epoch+1}"):
+                for _ in range(self.config.n_reflect_iterations):
+                    trace = self._generate(task)
+                    delta = self.reflector.reflect([trace], task.answer)
                     self.playbook.update(delta)
 
+    async def train_async(self, tasks: TaskSource, epochs: int = 1) -> None:
+        """Async variant of :meth:`train` running up to ``pipeline_max_concurrency`` tasks at once.
+
+        The blocking generate/reflect calls run in worker threads so their LLM
+        round-trips overlap; playbook merges are serialized.
+        """
+
+        factory = _task_factory(tasks, epochs)
+        update_lock = asyncio.Lock()
+        semaphore = asyncio.Semaphore(max(1, self.config.pipeline_max_concurrency))
+        for epoch in range(epochs):
+            logger.info("Offline epoch %d/%d", epoch + 1, epochs)
+            pending: List[asyncio.Task] = []
+            for task in _progress(factory(), desc=f"epoch-{epoch+1}"):
+                # Acquire before scheduling so streamed tasks are pulled lazily.
+                await semaphore.acquire()
+                for job in pending:
+                    if job.done():
+                        job.result()  # surface failures without waiting for the epoch
+                pending = [job for job in pending if not job.done()]
+                job = asyncio.create_task(self._train_task(task, update_lock))
+                job.add_done_callback(lambda _: semaphore.release())
+                pending.append(job)
+            await asyncio.gather(*pending)
+
+    async def _train_task(self, task: Task, update_lock: asyncio.Lock) -> None:
+        for _ in range(self.config.n_reflect_iterations):
+            trace = await asyncio.to_thread(self._generate, task)
+            delta = await asyncio.to_thread(self.reflector.reflect, [trace], task.answer)
+            async with update_lock:
+                await asyncio.to_thread(self.playbook.update, delta)
+
+    def _generate(self, task: Task) -> Trace:
+        context = self.playbook.retrieve(task.query)
+        trace = self.generator.run(task.query, context, record=False)
+        trace.metadata["expected_answer"] = task.answer or ""
+        trace.success = self._evaluate(trace, task)
+        # Recorded once evaluated; the storage writer batches the inserts.
+        self.playbook.storage.record_trace(trace)
+        self.playbook.storage.update_usage_many(
+            (bullet_id, trace.success) for bullet_id in trace.selected_bullet_ids
+        )
+        return trace
+
     def _evaluate(self, trace: Trace, task: Task) -> bool:
         expected = task.answer
         if expected is None and task.metadata:
             expected = task.metadata.get("expected")
         if expected is None:
             return False
-        evaluator = get_evaluator(task.evaluator, task.evaluator_params)
+        evaluator = task.resolve_evaluator()
         return evaluator.evaluate(expected or "", trace.response or "", task.evaluator_params)
 
 
 def run_offline(config: ACEConfig, adapter: CSVQAAdapter, epochs: int = 1) -> Playbook:
     playbook = Playbook.initialize(config)
     pipeline = OfflinePipeline(config, playbook)
-    tasks = list(adapter.iter_tasks())
-    pipeline.train(tasks, epochs=epochs)
+    pipeline.train(adapter.iter_tasks, epochs=epochs)
     return playbook
@@ -3,15 +3,17 @@
 from __future__ import annotations
 
 import logging
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Iterable, Iterator, Optional
+from typing import Iterable, Iterator, List, Optional
 
 from .config import ACEConfig
-from .evaluation import get_evaluator
+from .evaluation import BaseEvaluator, get_evaluator
 from .generator import Generator
 from .playbook import Playbook
 from .reflector import Reflector
-from .schemas import Trace
+from .schemas import ContextSlice, Trace
 from .utils import seed_everything
 
 logger = logging.getLogger(__name__)
@@ -24,6 +26,16 @@ class Episode:
     metadata: Optional[dict] = None
     evaluator: str = "exact"
     evaluator_params: dict = field(default_factory=dict)
+    _evaluator: Optional[BaseEvaluator] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def resolve_evaluator(self) -> BaseEvaluator:
+        """Build the evaluator once; it is reused across epochs and reflect iterations."""
+
+        if self._evaluator is None:
+            self._evaluator = get_evaluator(self.evaluator, self.evaluator_params)
+        return self._evaluator
 
 
 class OnlinePipeline:
@@ -33,18 +45,71 @@ class OnlinePipeline:
         seed_everything(config.random_seed)
         self.generator = Generator(config, playbook.storage)
         self.reflector = Reflector(config)
+        # Curator merges read then write the playbook, so they run one at a time.
+        self._update_lock = threading.Lock()
+
+    def run(
+        self, episodes: Iterable[Episode], batch_size: int = 1, max_workers: int = 1
+    ) -> Iterator[Trace]:
+        """Run episodes, yielding one trace per reflect iteration in episode order.
+
+        With ``batch_size > 1`` the first-iteration contexts of each batch are
+        retrieved together (one embedding call and one matmul), so later
+        episodes in a batch do not see playbook updates made by earlier ones.
+        With ``max_workers > 1`` the episodes of a batch run on a thread pool so
+        their LLM calls overlap; playbook writes stay serialized.
+        """
 
-    def run(self, episodes: Iterable[Episode]) -> Iterator[Trace]:
+        if max_workers <= 1:
+            yield from self._run_batches(episodes, batch_size, None)
+            return
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            yield from self._run_batches(episodes, batch_size, executor)
+
+    def _run_batches(
+        self, episodes: Iterable[Episode], batch_size: int, executor: Optional[Executor]
+    ) -> Iterator[Trace]:
+        batch: List[Episode] = []
         for episode in episodes:
-            for iteration in range(self.config.n_reflect_iterations):
+            batch.append(episode)
+            if len(batch) >= batch_size:
+                yield from self._run_batch(batch, executor)
+                batch = []
+        if batch:
+            yield from self._run_batch(batch, executor)
+
+    def _run_batch(self, batch: List[Episode], executor: Optional[Executor]) -> Iterator[Trace]:
+        if len(batch) == 1:
+            contexts = [self.playbook.retrieve(batch[0].query)]
+        else:
+            contexts = self.playbook.retrieve_many([episode.query for episode in batch])
+        if executor is None or len(batch) == 1:
+            results = map(self._run_episode, batch, contexts)
+        else:
+            results = executor.map(self._run_episode, batch, contexts)
+        for traces in results:
+            yield from traces
+
+    def _run_episode(self, episode: Episode, context: ContextSlice) -> List[Trace]:
+        traces: List[Trace] = []
+        for iteration in range(self.config.n_reflect_iterations):
+            if iteration:
                 context = self.playbook.retrieve(episode.query)
-                trace = self.generator.run(episode.query, context)
-                trace.success = self._evaluate(trace, episode)
-                for bullet_id in trace.selected_bullet_ids:
-                    self.playbook.storage.update_usage(bullet_id, trace.success)
-                delta = self.reflector.reflect([trace], label=episode.answer)
+            trace = self.generator.run(episode.query, context, record=False)
+            trace.success = self._evaluate(trace, episode)
+            # Recorded once evaluated; the storage writer batches the inserts.
+            self.playbook.storage.record_trace(trace)
+            # Usage counters share the merge lock: a merge reads bullets before
+            # writing them back, and must not interleave with these increments.
+            with self._update_lock:
+                self.playbook.storage.update_usage_many(
+                    (bullet_id, trace.success) for bullet_id in trace.selected_bullet_ids
+                )
+            delta = self.reflector.reflect([trace], label=episode.answer)
+            with self._update_lock:
                 self.playbook.update(delta)
-                yield trace
+            traces.append(trace)
+        return traces
 
     def _evaluate(self, trace: Trace, episode: Episode) -> bool:
         expected = episode.answer
@@ -52,5 +117,5 @@ class OnlinePipeline:
             expected = episode.metadata.get("expected")
         if expected is None:
             return False
-        evaluator = get_evaluator(episode.evaluator, episode.evaluator_params)
+        evaluator = episode.resolve_evaluator()
         return evaluator.evaluate(expected or "", trace.response or "", episode.evaluator_params)
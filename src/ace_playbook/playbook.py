@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Iterable
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Iterable, List, Sequence
 
 from .config import ACEConfig
 from .curator import Curator
@@ -12,6 +14,9 @@ from .retrieval import Retriever
 from .schemas import ContextSlice, DeltaRuntime, MergeReport
 from .storage import PlaybookStorage
 
+# Entries kept in the query-embedding LRU cache.
+_QUERY_CACHE_SIZE = 1024
+
 
 @dataclass
 class Playbook:
@@ -20,6 +25,10 @@ class Playbook:
     embedder: BaseEmbeddings
     retriever: Retriever
     curator: Curator
+    _query_vectors: "OrderedDict[str, Any]" = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+    _cache_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
 
     @classmethod
     def initialize(cls, config: ACEConfig | None = None) -> "Playbook":
@@ -31,15 +40,45 @@ class Playbook:
         return cls(config=config, storage=storage, embedder=embedder, retriever=retriever, curator=curator)
 
     def retrieve(self, query: str) -> ContextSlice:
-        return self.retriever.retrieve_for_query(query, self.embedder)
+        """Retrieve a context for ``query``, caching its embedding by text."""
+
+        with self._cache_lock:
+            vector = _lru_get(self._query_vectors, query)
+        if vector is None:
+            vectors = self.embedder.embed_texts([query]).vectors
+            if not len(vectors):
+                return ContextSlice(bullets=[])
+            vector = vectors[0]
+            with self._cache_lock:
+                _lru_put(self._query_vectors, query, vector)
+        return self.retriever.retrieve(vector)
+
+    def retrieve_many(self, queries: Sequence[str]) -> List[ContextSlice]:
+        """Retrieve contexts for several queries with one embedding call."""
+
+        return self.retriever.retrieve_for_queries(queries, self.embedder)
 
     def update(self, delta: DeltaRuntime) -> MergeReport:
         return self.curator.merge(delta)
 
     def stats(self) -> dict:
-        bullets = self.storage.list_bullets()
+        counts = self.storage.count_bullets_by_kind()
         return {
-            "total_bullets": len(bullets),
-            "strategies": sum(1 for b in bullets if b.kind == "strategy"),
-            "rules": sum(1 for b in bullets if b.kind == "rule"),
+            "total_bullets": sum(counts.values()),
+            "strategies": counts.get("strategy", 0),
+            "rules": counts.get("rule", 0),
         }
+
+
+def _lru_get(cache: OrderedDict, key: Any) -> Any:
+    value = cache.get(key)
+    if value is not None:
+        cache.move_to_end(key)
+    return value
+
+
+def _lru_put(cache: OrderedDict, key: Any, value: Any) -> None:
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > _QUERY_CACHE_SIZE:
+        cache.popitem(last=False)
@@ -2,14 +2,13 @@
 
 from __future__ import annotations
 
-import json
 import logging
-from typing import Iterable, List, Optional
+from typing import Iterable, List, Optional, Set
 
 from .config import ACEConfig
 from .llm_client import SyncChatClient
-from .schemas import Bullet, BulletPatch, DeltaRuntime, DeltaSchema, Trace
-from .utils import load_prompt_template
+from .schemas import Bullet, BulletPatch, DeltaRuntime, Trace, parse_delta
+from .utils import json_dumps, load_prompt_template
 
 logger = logging.getLogger(__name__)
 
@@ -35,23 +34,24 @@ class Reflector:
             {"role": "system", "content": self.system_prompt},
             {
                 "role": "user",
-                "content": json.dumps(
+                "content": json_dumps(
                     {
                         "label": label,
-                        "traces": [trace.to_dict() for trace in traces],
-                    },
-                    ensure_ascii=False,
+                        # Serialized natively; no intermediate to_dict() copies.
+                        "traces": traces,
+                    }
                 ),
             },
         ]
-        response = self.client.chat(messages, max_tokens=1200)
+        # Stream and stop at the closing brace; an invalid prefix falls back to
+        # the heuristic reflector rather than paying for a second request.
+        response = self.client.chat(messages, max_tokens=1200, stream=True)
         content = response.get("choices", [{}])[0].get("message", {}).get("content", "{}")
         try:
-            schema = DeltaSchema.model_validate_json(content)
+            delta = parse_delta(content)
         except Exception:  # noqa: BLE001
             logger.error("Reflector response not valid JSON: %s", content)
             return self._heuristic_reflect(traces)
-        delta = schema.to_runtime()
         return self._filter_delta(delta, traces)
 
     def _heuristic_reflect(self, traces: List[Trace]) -> DeltaRuntime:
@@ -82,12 +82,15 @@ class Reflector:
         return self._filter_delta(DeltaRuntime(bullets=bullets, patches=patches, traces=traces), traces)
 
     def _filter_delta(self, delta: DeltaRuntime, traces: List[Trace]) -> DeltaRuntime:
-        helpful_ids = {bid for trace in traces for bid in trace.used_bullet_ids}
-        misleading_ids = {bid for trace in traces for bid in trace.misleading_bullet_ids}
-        gaps_exist = any(
-            (not trace.success) and (not trace.used_bullet_ids) and (not trace.misleading_bullet_ids)
-            for trace in traces
-        )
+        # One pass over the traces collects all three signals.
+        helpful_ids: Set[str] = set()
+        misleading_ids: Set[str] = set()
+        gaps_exist = False
+        for trace in traces:
+            helpful_ids.update(trace.used_bullet_ids)
+            misleading_ids.update(trace.misleading_bullet_ids)
+            if not (trace.success or trace.used_bullet_ids or trace.misleading_bullet_ids):
+                gaps_exist = True
         filtered_bullets = delta.bullets if gaps_exist else []
         filtered_patches = [
             patch
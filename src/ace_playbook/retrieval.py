@@ -2,53 +2,91 @@
 
 from __future__ import annotations
 
+import copy
 import logging
-from datetime import datetime
-from math import log1p
-from typing import Iterable, List, Tuple
+import time
+from typing import Iterable, List, Sequence
+
+import numpy as np
 
 from .config import ACEConfig
-from .schemas import Bullet, ContextSlice, cosine_similarity
+from .schemas import ContextSlice, normalize_rows
 from .storage import PlaybookStorage
 
 logger = logging.getLogger(__name__)
 
 
+_SECONDS_PER_DAY = 86400
+
+
+def _topk(scores: np.ndarray, k: int) -> np.ndarray:
+    """Return indices of the ``k`` largest scores along the last axis, best first.
+
+    Uses ``argpartition`` (O(N)) and only sorts the ``k`` winners.
+    """
+
+    n = scores.shape[-1]
+    k = min(k, n)
+    if k <= 0:
+        return np.empty(scores.shape[:-1] + (0,), dtype=np.intp)
+    if k < n:
+        top = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+    else:
+        top = np.broadcast_to(np.arange(n), scores.shape)
+    order = np.argsort(-np.take_along_axis(scores, top, axis=-1), axis=-1, kind="stable")
+    return np.take_along_axis(top, order, axis=-1)
+
+
 class Retriever:
     def __init__(self, config: ACEConfig, storage: PlaybookStorage):
         self.config = config
         self.storage = storage
 
-    def retrieve(self, query_embedding: List[float]) -> ContextSlice:
-        bullets, vectors = self.storage.fetch_embeddings()
-        if not len(bullets):
-            return ContextSlice(bullets=[])
-        scores: List[Tuple[float, Bullet]] = []
-        now = datetime.utcnow()
-        for vector, bullet in zip(vectors, bullets):
-            if len(query_embedding) != len(vector):
-                continue
-            sim = cosine_similarity(query_embedding, vector)
-            helpful_bonus = self.config.retrieval_beta * log1p(bullet.helpful_count)
-            harmful_penalty = self.config.retrieval_gamma * log1p(bullet.harmful_count)
-            freshness = 0.0
-            if bullet.last_used_at:
-                delta = now - bullet.last_used_at
-                months = max(delta.days / 30.0, 0.0)
-                freshness = self.config.retrieval_freshness / (1 + months)
-            rank_score = (
-                self.config.retrieval_alpha * float(sim)
-                + helpful_bonus
-                - harmful_penalty
-                + freshness
-            )
-            scores.append((rank_score, bullet))
-        scores.sort(key=lambda x: x[0], reverse=True)
-        top_bullets = [bullet for _, bullet in scores[: self.config.retrieval_top_k]]
-        return ContextSlice(bullets=top_bullets)
+    def retrieve(self, query_embedding: Sequence[float]) -> ContextSlice:
+        return self.retrieve_many([query_embedding])[0]
 
     def retrieve_for_query(self, query: str, embedder) -> ContextSlice:
         embedding = embedder.embed_texts([query]).vectors
-        if not embedding:
+        if not len(embedding):
             return ContextSlice(bullets=[])
         return self.retrieve(embedding[0])
+
+    def retrieve_many(self, query_embeddings: Sequence[Sequence[float]]) -> List[ContextSlice]:
+        """Score several queries against the playbook with a single matmul."""
+
+        queries = normalize_rows(query_embeddings)
+        if self.storage.embedding_dim != queries.shape[1]:
+            return [ContextSlice(bullets=[]) for _ in range(len(queries))]
+        features = self.storage.fetch_features()
+        ids, sims = self.storage.embedding_similarities(queries)
+        if ids is not features.ids:
+            # The cache changed between the two snapshots; score the common rows.
+            row_of = {bullet_id: row for row, bullet_id in enumerate(ids)}
+            common = [pos for pos, bullet_id in enumerate(features.ids) if bullet_id in row_of]
+            sims = sims[:, [row_of[features.ids[pos]] for pos in common]]
+            features = features.select(common)
+        config = self.config
+        days = (int(time.time()) - features.last_used) // _SECONDS_PER_DAY
+        freshness = np.where(
+            features.last_used >= 0,
+            config.retrieval_freshness / (1.0 + np.maximum(days / 30.0, 0.0)),
+            0.0,
+        )
+        prior = (
+            config.retrieval_beta * np.log1p(features.helpful)
+            - config.retrieval_gamma * np.log1p(features.harmful)
+            + freshness
+        )
+        rank = config.retrieval_alpha * sims + prior
+        top = _topk(rank, config.retrieval_top_k)
+        # Copy so callers never share the cached bullets that usage patches mutate.
+        bullets = features.bullets
+        return [ContextSlice(bullets=[copy.copy(bullets[i]) for i in row]) for row in top]
+
+    def retrieve_for_queries(self, queries: Sequence[str], embedder) -> List[ContextSlice]:
+        if not queries:
+            return []
+        embeddings = embedder.embed_texts(list(queries)).vectors
+        if not len(embeddings):
+            return [ContextSlice(bullets=[]) for _ in queries]
+        return self.retrieve_many(embeddings)
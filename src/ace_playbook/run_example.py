@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import json
 from pathlib import Path
 
 from .config import ACEConfig
@@ -12,6 +11,7 @@ from .pipeline_online import Episode, OnlinePipeline
 from .playbook import Playbook
 from .retrieval import Retriever
 from .storage import PlaybookStorage
+from .utils import json_dumps, json_loads
 
 
 class StubEmbeddings(BaseEmbeddings):
@@ -22,12 +22,12 @@ class StubEmbeddings(BaseEmbeddings):
 
 def _fake_chat(self, messages, **kwargs):
     system = messages[0]["content"]
-    payload = json.loads(messages[1]["content"])
+    payload = json_loads(messages[1]["content"])
     if "ACE Generator" in system:
         bullets = payload.get("bullets", [])
         if bullets:
             bullet_id = bullets[0]["id"]
-            content = json.dumps(
+            content = json_dumps(
                 {
                     "answer": "example answer",
                     "used_bullet_ids": [bullet_id],
@@ -36,7 +36,7 @@ def _fake_chat(self, messages, **kwargs):
                 }
             )
         else:
-            content = json.dumps(
+            content = json_dumps(
                 {
                     "answer": "needs guidance",
                     "used_bullet_ids": [],
@@ -46,7 +46,7 @@ def _fake_chat(self, messages, **kwargs):
             )
         return {"choices": [{"message": {"content": content}}], "usage": {}}
     if "ACE Reflector" in system:
-        content = json.dumps(
+        content = json_dumps(
             {
                 "bullets": [
                     {
@@ -6,19 +6,33 @@ FORBIDDEN_PATTERNS = [re.compile(p, re.IGNORECASE) for p in [
     r"(?:(?:rm\s+-rf)|shutdown|format\s+c:)", # destructive ops
 ]]
 
+# One alternation so a body is scanned once (the tokens contain no letters,
+# so IGNORECASE does not change what they match).
+_FORBIDDEN_RE = re.compile(
+    "|".join(f"(?:{p})" for p in FORBIDDEN_TOKENS + [p.pattern for p in FORBIDDEN_PATTERNS]),
+    re.IGNORECASE,
+)
+# Literals at least one of which occurs (case-folded) in every match of
+# _FORBIDDEN_RE. Plain substring checks run in C's fast search, so clean bodies
+# skip the case-insensitive regex walk; keep in sync with the patterns above.
+_FORBIDDEN_HINTS = ("<<", ">>", "<|", "|>", "curl", "wget", "-rf", "shutdown", "c:")
+_FENCE_RE = re.compile(r"```+\s*")
+# Stray control chars (keeps \t, \n, \r) for str.translate deletion.
+_CTRL_TABLE = dict.fromkeys([*range(0x00, 0x09), 0x0B, 0x0C, *range(0x0E, 0x20)])
+
 
 def sanitize_text(s: str) -> str:
     # Normalize code fences and strip stray control chars
     s = s.replace("\r\n", "\n")
-    s = re.sub(r"```+\s*", "```", s)
-    s = re.sub(r"[\x00-\x08\x0B\x0C\x0E-\x1F]", "", s)
-    return s
+    s = _FENCE_RE.sub("```", s)
+    return s.translate(_CTRL_TABLE)
 
 
 def contains_forbidden(s: str) -> bool:
-    if any(re.search(tok, s) for tok in FORBIDDEN_TOKENS):
-        return True
-    return any(p.search(s) for p in FORBIDDEN_PATTERNS)
+    lowered = s.casefold()
+    if not any(hint in lowered for hint in _FORBIDDEN_HINTS):
+        return False
+    return _FORBIDDEN_RE.search(s) is not None
 
 
 def validate_bullet_body(body: str) -> None:
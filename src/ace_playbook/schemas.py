@@ -2,25 +2,97 @@
 
 from __future__ import annotations
 
-import json
-import uuid
-from dataclasses import asdict, dataclass, field
-from datetime import datetime
+import contextvars
+import os
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timezone
 from math import sqrt
 from pathlib import Path
-from typing import Dict, List, Literal, Optional
-
-from pydantic import BaseModel, Field
-
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Sequence,
+    Union,
+    get_args,
+)
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field
+
+from ._kernels import HAVE_NUMBA, cosine_kernel
 from .sanitize import sanitize_text, validate_bullet_body
+from .utils import json_dumps_pretty
 
 BulletKind = Literal["strategy", "rule", "pitfall", "template", "tool", "concept"]
 EditOp = Literal["inc_helpful", "inc_harmful", "patch"]
 PatchMode = Literal["append", "replace"]
 
+_KIND_LABELS = {kind: kind.upper() for kind in get_args(BulletKind)}
+# Canonical objects for the literal enum values, so decoded bullets and patches
+# share one string per value instead of holding a fresh copy each.
+_LITERALS = {
+    value: sys.intern(value)
+    for value in (*get_args(BulletKind), *get_args(EditOp), *get_args(PatchMode))
+}
+
+
+# Bound once: bulk (de)serialisation calls these for every bullet and trace.
+_fromisoformat = datetime.fromisoformat
+_fromtimestamp = datetime.fromtimestamp
+_isoformat = datetime.isoformat
+_time = time.time
+_UTC = timezone.utc
+
+
+def _new_id() -> str:
+    """Random 128-bit hex id; cheaper than ``str(uuid.uuid4())``."""
+
+    return os.urandom(16).hex()
+
 
 def _now() -> datetime:
-    return datetime.utcnow()
+    return _fromtimestamp(_time(), tz=_UTC)
+
+
+def _as_utc(moment: Optional[datetime]) -> Optional[datetime]:
+    """Timestamps are timezone-aware UTC; naive values (older rows) are taken as UTC."""
+
+    if moment is None or moment.tzinfo is not None:
+        return moment
+    return moment.replace(tzinfo=_UTC)
+
+
+def _as_embedding(vector: Optional[Sequence[float]]) -> Optional[np.ndarray]:
+    """Coerce an embedding to a 1-D float32 array; empty vectors become ``None``."""
+
+    if vector is None:
+        return None
+    array = np.asarray(vector, dtype=np.float32).reshape(-1)
+    return array if array.size else None
+
+
+_TRUSTED_LOAD: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "ace_trusted_load", default=False
+)
+
+
+@contextmanager
+def trusted_load() -> Iterator[None]:
+    """Skip body re-validation for bullets built in this block (already-validated data)."""
+
+    token = _TRUSTED_LOAD.set(True)
+    try:
+        yield
+    finally:
+        _TRUSTED_LOAD.reset(token)
 
 
 def _validate_body(body: str) -> str:
@@ -29,43 +101,96 @@ def _validate_body(body: str) -> str:
     return body
 
 
-@dataclass
+@dataclass(slots=True)
 class Bullet:
     kind: BulletKind
     title: str
     body: str
     tags: List[str] = field(default_factory=list)
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=_new_id)
     created_at: datetime = field(default_factory=_now)
     last_used_at: Optional[datetime] = None
     helpful_count: int = 0
     harmful_count: int = 0
     score: float = 0.0
-    embedding: Optional[List[float]] = None
+    # float32; lists are coerced on construction. Compared in ``__eq__`` with np.array_equal.
+    embedding: Optional[np.ndarray] = field(default=None, compare=False)
     source_trace_ids: List[str] = field(default_factory=list)
     version: int = 0
     duplicate_of: Optional[str] = None
 
     def __post_init__(self) -> None:
+        self.embedding = _as_embedding(self.embedding)
+        self.created_at = _as_utc(self.created_at)
+        self.last_used_at = _as_utc(self.last_used_at)
+        if not _TRUSTED_LOAD.get():
+            self.validate()
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        for name in _BULLET_EQ_FIELDS:
+            if getattr(self, name) != getattr(other, name):
+                return False
+        if self.embedding is None or other.embedding is None:
+            return self.embedding is other.embedding
+        return bool(np.array_equal(self.embedding, other.embedding))
+
+    def validate(self) -> None:
+        """Re-check bullet invariants in place (body sanitised and within limits)."""
         self.body = _validate_body(self.body)
 
     def to_dict(self) -> Dict[str, object]:
-        payload = asdict(self)
-        payload["created_at"] = self.created_at.isoformat()
-        payload["last_used_at"] = self.last_used_at.isoformat() if self.last_used_at else None
-        return payload
+        # Built by hand: ``asdict`` deep-copies every field and is noticeably slower.
+        return {
+            "kind": self.kind,
+            "title": self.title,
+            "body": self.body,
+            "tags": list(self.tags),
+            "id": self.id,
+            "created_at": _isoformat(self.created_at),
+            "last_used_at": _isoformat(self.last_used_at) if self.last_used_at else None,
+            "helpful_count": self.helpful_count,
+            "harmful_count": self.harmful_count,
+            "score": self.score,
+            "embedding": self.embedding.tolist() if self.embedding is not None else None,
+            "source_trace_ids": list(self.source_trace_ids),
+            "version": self.version,
+            "duplicate_of": self.duplicate_of,
+        }
 
     @classmethod
-    def from_dict(cls, data: Dict[str, object]) -> "Bullet":
-        payload = dict(data)
-        if isinstance(payload.get("created_at"), str):
-            payload["created_at"] = datetime.fromisoformat(payload["created_at"])
-        if isinstance(payload.get("last_used_at"), str) and payload["last_used_at"]:
-            payload["last_used_at"] = datetime.fromisoformat(payload["last_used_at"])
-        return cls(**payload)  # type: ignore[arg-type]
+    def from_dict(cls, data: Mapping[str, Any]) -> "Bullet":
+        # Fields are read straight from ``data``; the caller's mapping is not copied.
+        kind = data["kind"]
+        created_at = data.get("created_at")
+        if type(created_at) is str:
+            created_at = _fromisoformat(created_at)
+        last_used_at = data.get("last_used_at")
+        if type(last_used_at) is str:
+            last_used_at = _fromisoformat(last_used_at) if last_used_at else None
+        return cls(
+            kind=_LITERALS.get(kind, kind),
+            title=data["title"],
+            body=data["body"],
+            tags=data.get("tags") or [],
+            id=data.get("id") or _new_id(),
+            created_at=created_at or _now(),
+            last_used_at=last_used_at,
+            helpful_count=data.get("helpful_count", 0),
+            harmful_count=data.get("harmful_count", 0),
+            score=data.get("score", 0.0),
+            embedding=data.get("embedding"),
+            source_trace_ids=data.get("source_trace_ids") or [],
+            version=data.get("version", 0),
+            duplicate_of=data.get("duplicate_of"),
+        )
+
 
+_BULLET_EQ_FIELDS = tuple(f.name for f in fields(Bullet) if f.compare)
 
-@dataclass
+
+@dataclass(slots=True)
 class BulletPatch:
     bullet_id: str
     op: EditOp
@@ -73,14 +198,23 @@ class BulletPatch:
     patch_mode: PatchMode = "append"
 
     def to_dict(self) -> Dict[str, object]:
-        return asdict(self)
+        return {
+            "bullet_id": self.bullet_id,
+            "op": self.op,
+            "patch_text": self.patch_text,
+            "patch_mode": self.patch_mode,
+        }
 
     @classmethod
     def from_dict(cls, data: Dict[str, object]) -> "BulletPatch":
-        return cls(**data)  # type: ignore[arg-type]
+        payload = dict(data)
+        for key in ("op", "patch_mode"):
+            if key in payload:
+                payload[key] = _LITERALS.get(payload[key], payload[key])
+        return cls(**payload)  # type: ignore[arg-type]
 
 
-@dataclass
+@dataclass(slots=True)
 class Trace:
     query: str
     selected_bullet_ids: List[str]
@@ -91,26 +225,52 @@ class Trace:
     used_bullet_ids: List[str] = field(default_factory=list)
     misleading_bullet_ids: List[str] = field(default_factory=list)
     attribution_notes: Dict[str, str] = field(default_factory=dict)
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=_new_id)
     created_at: datetime = field(default_factory=_now)
 
     def to_dict(self) -> Dict[str, object]:
-        payload = asdict(self)
-        payload["created_at"] = self.created_at.isoformat()
-        return payload
+        return {
+            "query": self.query,
+            "selected_bullet_ids": list(self.selected_bullet_ids),
+            "prompt": self.prompt,
+            "response": self.response,
+            "success": self.success,
+            "metadata": dict(self.metadata),
+            "used_bullet_ids": list(self.used_bullet_ids),
+            "misleading_bullet_ids": list(self.misleading_bullet_ids),
+            "attribution_notes": dict(self.attribution_notes),
+            "id": self.id,
+            "created_at": _isoformat(self.created_at),
+        }
 
     @classmethod
-    def from_dict(cls, data: Dict[str, object]) -> "Trace":
-        payload = dict(data)
-        if isinstance(payload.get("created_at"), str):
-            payload["created_at"] = datetime.fromisoformat(payload["created_at"])
-        payload.setdefault("used_bullet_ids", [])
-        payload.setdefault("misleading_bullet_ids", [])
-        payload.setdefault("attribution_notes", {})
-        return cls(**payload)  # type: ignore[arg-type]
+    def from_dict(cls, data: Mapping[str, Any]) -> "Trace":
+        created_at = data.get("created_at")
+        if type(created_at) is str:
+            created_at = _as_utc(_fromisoformat(created_at))
+        return cls(
+            query=data["query"],
+            selected_bullet_ids=data["selected_bullet_ids"],
+            prompt=data["prompt"],
+            response=data["response"],
+            success=data["success"],
+            metadata=data.get("metadata") or {},
+            used_bullet_ids=data.get("used_bullet_ids") or [],
+            misleading_bullet_ids=data.get("misleading_bullet_ids") or [],
+            attribution_notes=data.get("attribution_notes") or {},
+            id=data.get("id") or _new_id(),
+            created_at=created_at or _now(),
+        )
+
+
+# Under the optional Cython build methods are cyfunctions, which pydantic would
+# otherwise take for unannotated fields.
+_MODEL_CONFIG = ConfigDict(ignored_types=(type(_validate_body),))
 
 
 class BulletSchema(BaseModel):
+    model_config = _MODEL_CONFIG
+
     kind: Literal["strategy", "rule", "pitfall", "template", "tool", "concept"]
     title: str = Field(..., max_length=160)
     body: str = Field(..., max_length=1200)
@@ -127,26 +287,30 @@ class BulletSchema(BaseModel):
     duplicate_of: Optional[str] = None
 
     def to_runtime(self) -> Bullet:
+        # Containers are handed over rather than copied: schemas are transient
+        # and discarded right after conversion.
         return Bullet(
-            kind=self.kind,
+            kind=_LITERALS.get(self.kind, self.kind),
             title=self.title,
             body=self.body,
-            tags=list(self.tags),
-            id=self.id or str(uuid.uuid4()),
+            tags=self.tags,
+            id=self.id or _new_id(),
             created_at=self.created_at or _now(),
             last_used_at=self.last_used_at,
             helpful_count=self.helpful_count,
             harmful_count=self.harmful_count,
             score=self.score,
             embedding=self.embedding,
-            source_trace_ids=list(self.source_trace_ids),
+            source_trace_ids=self.source_trace_ids,
             version=self.version,
             duplicate_of=self.duplicate_of,
         )
 
     @classmethod
     def from_runtime(cls, bullet: Bullet) -> "BulletSchema":
-        return cls(
+        # Runtime bullets are already validated; re-validating a full embedding list
+        # element by element dominates the conversion cost.
+        return cls.model_construct(
             kind=bullet.kind,
             title=bullet.title,
             body=bullet.body,
@@ -157,12 +321,14 @@ class BulletSchema(BaseModel):
             helpful_count=bullet.helpful_count,
             harmful_count=bullet.harmful_count,
             score=bullet.score,
-            embedding=bullet.embedding,
+            embedding=bullet.embedding.tolist() if bullet.embedding is not None else None,
             source_trace_ids=list(bullet.source_trace_ids),
             version=bullet.version,
             duplicate_of=bullet.duplicate_of,
         )
 class BulletPatchSchema(BaseModel):
+    model_config = _MODEL_CONFIG
+
     bullet_id: str
     op: EditOp
     patch_text: Optional[str] = None
@@ -171,9 +337,9 @@ class BulletPatchSchema(BaseModel):
     def to_runtime(self) -> BulletPatch:
         return BulletPatch(
             bullet_id=self.bullet_id,
-            op=self.op,
+            op=_LITERALS.get(self.op, self.op),
             patch_text=self.patch_text,
-            patch_mode=self.patch_mode,
+            patch_mode=_LITERALS.get(self.patch_mode, self.patch_mode),
         )
 
     @classmethod
@@ -187,6 +353,8 @@ class BulletPatchSchema(BaseModel):
 
 
 class TraceSchema(BaseModel):
+    model_config = _MODEL_CONFIG
+
     query: str
     selected_bullet_ids: List[str]
     used_bullet_ids: List[str] = Field(default_factory=list)
@@ -200,38 +368,40 @@ class TraceSchema(BaseModel):
     created_at: Optional[datetime] = None
 
     def to_runtime(self) -> Trace:
+        # As in BulletSchema.to_runtime, validated containers are handed over.
         return Trace(
             query=self.query,
-            selected_bullet_ids=list(self.selected_bullet_ids),
-            used_bullet_ids=list(self.used_bullet_ids),
-            misleading_bullet_ids=list(self.misleading_bullet_ids),
-            attribution_notes=dict(self.attribution_notes),
+            selected_bullet_ids=self.selected_bullet_ids,
+            used_bullet_ids=self.used_bullet_ids,
+            misleading_bullet_ids=self.misleading_bullet_ids,
+            attribution_notes=self.attribution_notes,
             prompt=self.prompt,
             response=self.response,
             success=self.success,
-            metadata=dict(self.metadata),
-            id=self.id or str(uuid.uuid4()),
+            metadata=self.metadata,
+            id=self.id or _new_id(),
             created_at=self.created_at or _now(),
         )
 
     @classmethod
     def from_runtime(cls, trace: Trace) -> "TraceSchema":
+        # Validation already builds fresh containers, so no defensive copies here.
         return cls(
             query=trace.query,
-            selected_bullet_ids=list(trace.selected_bullet_ids),
-            used_bullet_ids=list(trace.used_bullet_ids),
-            misleading_bullet_ids=list(trace.misleading_bullet_ids),
-            attribution_notes=dict(trace.attribution_notes),
+            selected_bullet_ids=trace.selected_bullet_ids,
+            used_bullet_ids=trace.used_bullet_ids,
+            misleading_bullet_ids=trace.misleading_bullet_ids,
+            attribution_notes=trace.attribution_notes,
             prompt=trace.prompt,
             response=trace.response,
             success=trace.success,
-            metadata=dict(trace.metadata),
+            metadata=trace.metadata,
             id=trace.id,
             created_at=trace.created_at,
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class DeltaRuntime:
     bullets: List[Bullet] = field(default_factory=list)
     patches: List[BulletPatch] = field(default_factory=list)
@@ -240,29 +410,52 @@ class DeltaRuntime:
     def to_schema(self) -> "DeltaSchema":
         return DeltaSchema.from_runtime(self)
 
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "bullets": list(map(Bullet.to_dict, self.bullets)),
+            "patches": list(map(BulletPatch.to_dict, self.patches)),
+            "traces": list(map(Trace.to_dict, self.traces)),
+        }
+
 
 class DeltaSchema(BaseModel):
+    model_config = _MODEL_CONFIG
+
     bullets: List[BulletSchema] = Field(default_factory=list)
     patches: List[BulletPatchSchema] = Field(default_factory=list)
     traces: List[TraceSchema] = Field(default_factory=list)
 
     def to_runtime(self) -> DeltaRuntime:
+        # map() over the plain functions skips the per-item method lookup.
         return DeltaRuntime(
-            bullets=[item.to_runtime() for item in self.bullets],
-            patches=[item.to_runtime() for item in self.patches],
-            traces=[item.to_runtime() for item in self.traces],
+            bullets=list(map(BulletSchema.to_runtime, self.bullets)),
+            patches=list(map(BulletPatchSchema.to_runtime, self.patches)),
+            traces=list(map(TraceSchema.to_runtime, self.traces)),
         )
 
     @classmethod
     def from_runtime(cls, delta: DeltaRuntime) -> "DeltaSchema":
         return cls(
-            bullets=[BulletSchema.from_runtime(item) for item in delta.bullets],
-            patches=[BulletPatchSchema.from_runtime(item) for item in delta.patches],
-            traces=[TraceSchema.from_runtime(item) for item in delta.traces],
+            bullets=list(map(BulletSchema.from_runtime, delta.bullets)),
+            patches=list(map(BulletPatchSchema.from_runtime, delta.patches)),
+            traces=list(map(TraceSchema.from_runtime, delta.traces)),
         )
 
 Delta = DeltaRuntime
 
+
+def parse_delta(payload: Union[str, bytes, Dict[str, object]]) -> DeltaRuntime:
+    """Validate an external delta (JSON text or decoded mapping) into runtime objects.
+
+    This is the only place deltas are validated; internal code passes ``DeltaRuntime``.
+    """
+
+    if isinstance(payload, (str, bytes)):
+        schema = DeltaSchema.model_validate_json(payload)
+    else:
+        schema = DeltaSchema.model_validate(payload)
+    return schema.to_runtime()
+
 __all__ = [
     "Bullet",
     "BulletPatch",
@@ -276,22 +469,29 @@ __all__ = [
     "BulletPatchSchema",
     "TraceSchema",
     "export_delta_json_schema",
+    "parse_delta",
+    "trusted_load",
     "cosine_similarity",
+    "cosine_similarity_matrix",
+    "normalize_rows",
 ]
 
 
-@dataclass
+@dataclass(slots=True)
 class ContextSlice:
     bullets: List[Bullet]
 
     def to_prompt_fragment(self) -> str:
-        lines = []
-        for bullet in self.bullets:
-            lines.append(f"- [{bullet.kind.upper()}] {bullet.title}: {bullet.body}")
-        return "\n".join(lines)
+        labels = _KIND_LABELS
+        return "\n".join(
+            [
+                f"- [{labels.get(b.kind) or b.kind.upper()}] {b.title}: {b.body}"
+                for b in self.bullets
+            ]
+        )
 
 
-@dataclass
+@dataclass(slots=True)
 class MergeReport:
     added: int
     updated: int
@@ -299,7 +499,12 @@ class MergeReport:
     deduplicated: int
 
     def to_dict(self) -> Dict[str, int]:
-        return asdict(self)
+        return {
+            "added": self.added,
+            "updated": self.updated,
+            "skipped": self.skipped,
+            "deduplicated": self.deduplicated,
+        }
 
 
 def export_delta_json_schema(path: str) -> Dict[str, object]:
@@ -308,17 +513,55 @@ def export_delta_json_schema(path: str) -> Dict[str, object]:
     schema = DeltaSchema.model_json_schema(mode="validation")
     target = Path(path)
     target.parent.mkdir(parents=True, exist_ok=True)
-    target.write_text(json.dumps(schema, indent=2), encoding="utf-8")
+    target.write_bytes(json_dumps_pretty(schema))
     return schema
 
 
-def cosine_similarity(a: List[float], b: List[float]) -> float:
+def _cosine_numpy(a: np.ndarray, b: np.ndarray) -> float:
+    denom = float(np.dot(a, a)) * float(np.dot(b, b))
+    if denom == 0.0:
+        return 0.0
+    return float(np.dot(a, b)) / sqrt(denom)
+
+
+def cosine_similarity(a: Sequence[float], b: Sequence[float]) -> float:
     if len(a) != len(b):
         raise ValueError("vectors must have same length")
-    dot = sum(x * y for x, y in zip(a, b))
-    norm_a = sqrt(sum(x * x for x in a))
-    norm_b = sqrt(sum(y * y for y in b))
-    denom = norm_a * norm_b
-    if denom == 0:
-        return 0.0
-    return dot / denom
+    a = np.ascontiguousarray(a, dtype=np.float32)
+    b = np.ascontiguousarray(b, dtype=np.float32)
+    if not HAVE_NUMBA:
+        return _cosine_numpy(a, b)
+    return float(cosine_kernel(a, b))
+
+
+def _row_sq_norms(mat: np.ndarray) -> np.ndarray:
+    # One fused multiply-accumulate sweep per row, without the N x d temporary
+    # that ``np.linalg.norm(mat, axis=1)`` materialises.
+    return np.einsum("ij,ij->i", mat, mat)
+
+
+def cosine_similarity_matrix(
+    query: Union[np.ndarray, Sequence[float]], matrix: Union[np.ndarray, Sequence[Sequence[float]]]
+) -> np.ndarray:
+    """Cosine similarity of ``query`` against every row of ``matrix`` (one GEMV)."""
+
+    q = np.asarray(query, dtype=np.float32)
+    mat = np.asarray(matrix, dtype=np.float32)
+    if mat.size == 0:
+        return np.zeros(mat.shape[0], dtype=np.float32)
+    if mat.shape[1] != q.shape[0]:
+        raise ValueError("vectors must have same length")
+    denom = np.sqrt(_row_sq_norms(mat) * float(np.dot(q, q)))
+    sims = mat @ q
+    return np.divide(sims, denom, out=np.zeros_like(sims), where=denom != 0)
+
+
+def normalize_rows(matrix: Union[np.ndarray, Sequence[Sequence[float]]]) -> np.ndarray:
+    """Return ``matrix`` as float32 rows scaled to unit L2 norm; zero rows stay zero."""
+
+    mat = np.asarray(matrix, dtype=np.float32)
+    if mat.ndim == 1:
+        mat = mat.reshape(1, -1)
+    norms = np.sqrt(_row_sq_norms(mat))[:, None]
+    norms[norms == 0] = 1.0
+    return mat / norms
@@ -2,20 +2,371 @@
 
 from __future__ import annotations
 
-import json
+import logging
 import sqlite3
+import threading
+import time
+import weakref
+from collections import Counter
 from contextlib import contextmanager
-from datetime import datetime
-from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+import numpy as np
 
 from .config import ACEConfig
-from .schemas import Bullet, Trace
+from .schemas import (
+    _LITERALS,
+    Bullet,
+    Trace,
+    _as_utc,
+    _now,
+    normalize_rows,
+    trusted_load,
+)
+from .utils import dump_jsonl, json_dumps, json_loads
+
+logger = logging.getLogger(__name__)
+
+# Stay below SQLite's default limit of 999 bound parameters per statement.
+_MAX_SQL_PARAMS = 900
+# Rows dequantized per block when scoring against an int8 embedding cache.
+_DEQUANT_BLOCK_ROWS = 4096
+# The background writer commits once this many writes are queued, or after the
+# first queued write has waited this long.
+_WRITE_BATCH_ITEMS = 256
+_WRITE_COALESCE_SECONDS = 0.05
+_FLOAT32_BYTES = 4
+
+# Statement text is fixed so sqlite3's per-connection statement cache is reused.
+# ``_bullet_to_row`` / ``_trace_to_row`` build parameter tuples in this order.
+_BULLET_COLUMNS = (
+    "id",
+    "kind",
+    "title",
+    "body",
+    "tags",
+    "created_at",
+    "last_used_at",
+    "helpful_count",
+    "harmful_count",
+    "score",
+    "embedding",
+    "source_trace_ids",
+    "version",
+    "duplicate_of",
+)
+_TRACE_COLUMNS = (
+    "id",
+    "query",
+    "selected_bullet_ids",
+    "used_bullet_ids",
+    "misleading_bullet_ids",
+    "attribution_notes",
+    "prompt",
+    "response",
+    "success",
+    "metadata",
+    "created_at",
+)
+_SQL_UPSERT_BULLET = (
+    f"INSERT INTO bullets ({', '.join(_BULLET_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(_BULLET_COLUMNS))}) "
+    "ON CONFLICT(id) DO UPDATE SET "
+    + ", ".join(f"{col}=excluded.{col}" for col in _BULLET_COLUMNS[1:])
+)
+_SQL_INSERT_TRACE = (
+    f"INSERT OR REPLACE INTO traces ({', '.join(_TRACE_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(_TRACE_COLUMNS))})"
+)
+# Column-name converters (``detect_types=PARSE_COLNAMES``, registered below):
+# sqlite3 decodes these columns while fetching, so the row builders receive
+# parsed values. Names are prefixed because ``register_converter`` is process-wide.
+_COLUMN_CONVERTERS = {
+    "tags": "ace_json",
+    "created_at": "ace_timestamp",
+    "last_used_at": "ace_timestamp",
+    "embedding": "ace_float32",
+    "source_trace_ids": "ace_json",
+    "selected_bullet_ids": "ace_json",
+    "used_bullet_ids": "ace_json",
+    "misleading_bullet_ids": "ace_json",
+    "attribution_notes": "ace_json",
+    "metadata": "ace_json",
+}
+
+
+def _select_list(columns: Sequence[str]) -> str:
+    return ", ".join(
+        f'{col} AS "{col} [{_COLUMN_CONVERTERS[col]}]"' if col in _COLUMN_CONVERTERS else col
+        for col in columns
+    )
+
+
+# Readers select explicit columns and unpack plain tuples (no sqlite3.Row).
+_SQL_SELECT_ALL_BULLETS = f"SELECT {_select_list(_BULLET_COLUMNS)} FROM bullets"
+_SQL_SELECT_BULLET_BY_ID = f"{_SQL_SELECT_ALL_BULLETS} WHERE id=?"
+# Empty BLOBs are filtered in SQL so the readers never see them.
+_SQL_EMBEDDED = "embedding IS NOT NULL AND length(embedding) > 0"
+_SQL_SELECT_EMBEDDINGS = f"SELECT id, embedding FROM bullets WHERE {_SQL_EMBEDDED}"
+_SQL_SELECT_EMBEDDED_BULLETS = f"{_SQL_SELECT_ALL_BULLETS} WHERE {_SQL_EMBEDDED}"
+_SQL_SELECT_BULLET_PAGE = (
+    f"SELECT rowid, {_select_list(_BULLET_COLUMNS)} FROM bullets "
+    "WHERE rowid > ? ORDER BY rowid LIMIT ?"
+)
+_SQL_SELECT_RECENT_TRACES = (
+    # Trace timestamps are stored as UTC ISO-8601 text, which sorts chronologically,
+    # so the ORDER BY can walk idx_traces_created_at instead of sorting.
+    f"SELECT {_select_list(_TRACE_COLUMNS)} FROM traces ORDER BY created_at DESC LIMIT ?"
+)
+# Aggregate readers that answer from columns without building Bullet objects.
+_SQL_COUNT_BULLETS_BY_KIND = "SELECT kind, COUNT(*) FROM bullets GROUP BY kind"
+_SQL_SELECT_TOP_BULLET_IDS = (
+    "SELECT id FROM bullets "
+    "ORDER BY helpful_count - harmful_count DESC, created_at DESC, rowid LIMIT ?"
+)
+# prune_to_ids stages the keep-set in a temp table so it is not bound by the
+# SQL parameter limit and deletes with one anti-join.
+_SQL_CREATE_KEEP_IDS = "CREATE TEMP TABLE IF NOT EXISTS _keep_ids (id TEXT PRIMARY KEY)"
+_SQL_INSERT_KEEP_ID = "INSERT OR IGNORE INTO temp._keep_ids (id) VALUES (?)"
+_SQL_DELETE_NOT_KEPT = "DELETE FROM bullets WHERE id NOT IN (SELECT id FROM temp._keep_ids)"
+_SQL_DROP_KEEP_IDS = "DROP TABLE temp._keep_ids"
+_SQL_UPSERT_USAGE = (
+    "INSERT INTO bullet_usage (bullet_id, total_uses, last_used_at) VALUES (?, 1, ?) "
+    "ON CONFLICT(bullet_id) DO UPDATE SET "
+    "total_uses=total_uses+1, last_used_at=excluded.last_used_at"
+)
+_SQL_MARK_HELPFUL = "UPDATE bullets SET helpful_count=helpful_count+1, last_used_at=? WHERE id=?"
+_SQL_MARK_HARMFUL = "UPDATE bullets SET harmful_count=harmful_count+1, last_used_at=? WHERE id=?"
+# Curator patches add to the stored counters instead of writing back a value read
+# earlier, so usage updates that land in between are not overwritten.
+_SQL_ADD_COUNTS = (
+    "UPDATE bullets SET helpful_count=helpful_count+?, harmful_count=harmful_count+? WHERE id=?"
+)
+_SQL_SET_BODY = "UPDATE bullets SET body=? WHERE id=?"
+
+
+@lru_cache(maxsize=64)
+def _placeholders(count: int) -> str:
+    return ",".join("?" * count)
+
+
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=5000",
+)
+
+
+_fromisoformat = datetime.fromisoformat
+
+
+def _encode_embedding(vector: Optional[Sequence[float]]) -> Optional[bytes]:
+    if vector is None or not len(vector):
+        return None
+    return np.asarray(vector, dtype=np.float32).tobytes()
+
+
+def _decode_embedding(value: Optional[bytes]) -> Optional[np.ndarray]:
+    """Read-only float32 view over a stored embedding BLOB (no per-element parsing)."""
+
+    if not value:
+        return None
+    return np.frombuffer(value, dtype=np.float32)
+
+
+def _utc_isoformat(moment: datetime) -> str:
+    """ISO-8601 text in UTC, so stored timestamps compare correctly as strings."""
+
+    return _as_utc(moment).astimezone(timezone.utc).isoformat()
+
+
+def _decode_timestamp(raw: bytes) -> Optional[datetime]:
+    return _as_utc(_fromisoformat(raw.decode())) if raw else None
+
+
+sqlite3.register_converter("ace_json", json_loads)
+sqlite3.register_converter("ace_timestamp", _decode_timestamp)
+sqlite3.register_converter("ace_float32", _decode_embedding)
+
+
+def _epoch_seconds(moment: Optional[datetime]) -> int:
+    if moment is None:
+        return -1
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp())
+
+
+@dataclass
+class FeatureColumns:
+    """Retrieval features as columns aligned with the cached embedding rows."""
+
+    ids: List[str]
+    bullets: List[Bullet]
+    helpful: np.ndarray  # float32 helpful_count per row
+    harmful: np.ndarray  # float32 harmful_count per row
+    last_used: np.ndarray  # int64 epoch seconds of last_used_at, -1 if never used
+
+    def select(self, rows: List[int]) -> "FeatureColumns":
+        return FeatureColumns(
+            ids=[self.ids[row] for row in rows],
+            bullets=[self.bullets[row] for row in rows],
+            helpful=self.helpful[rows],
+            harmful=self.harmful[rows],
+            last_used=self.last_used[rows],
+        )
+
+
+class _WriteBuffer:
+    """Queue of deferred ``executemany`` batches committed by a background thread.
+
+    Queued writes are applied in one transaction per batch, grouped by statement,
+    so they must not depend on each other's order (inserts and increments). The
+    queue is only drained while holding the storage lock, so after :meth:`flush`
+    returns every write submitted before it is visible.
+
+    If a batch fails to commit, it is replayed one row at a time. Rows that still
+    fail are logged and dropped, so one bad write cannot block later ones or make
+    every reader raise.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, lock: threading.RLock):
+        self._conn = conn
+        self._lock = lock
+        self._pending: List[Tuple[str, list]] = []
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def submit(self, writes: Sequence[Tuple[str, list]]) -> None:
+        writes = [write for write in writes if write[1]]
+        if not writes:
+            return
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("storage is closed")
+            self._pending.extend(writes)
+            if self._thread is None:
+                # Started lazily; it references the buffer, never the storage.
+                self._thread = threading.Thread(
+                    target=self._run, name="ace-storage-writer", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify()
+
+    def flush(self) -> None:
+        with self._lock:
+            with self._cond:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return
+            statements: Dict[str, list] = {}
+            for sql, rows in batch:
+                statements.setdefault(sql, []).extend(rows)
+            try:
+                for sql, rows in statements.items():
+                    self._conn.executemany(sql, rows)
+                self._conn.commit()
+            except sqlite3.Error:
+                self._conn.rollback()
+                self._replay_rows(statements)
+            except BaseException:
+                self._conn.rollback()
+                raise
+
+    def _replay_rows(self, statements: Dict[str, list]) -> None:
+        try:
+            for sql, rows in statements.items():
+                for row in rows:
+                    try:
+                        self._conn.execute(sql, row)
+                    except sqlite3.Error as exc:
+                        logger.error("Dropping storage write that failed (%s): %s", exc, sql)
+            self._conn.commit()
+        except BaseException:
+            self._conn.rollback()
+            raise
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+        self.flush()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    # close() commits what is left.
+                    return
+                deadline = time.monotonic() + _WRITE_COALESCE_SECONDS
+                while len(self._pending) < _WRITE_BATCH_ITEMS and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+            try:
+                self.flush()
+            except Exception:  # noqa: BLE001
+                logger.exception("Background storage write failed")
+
+
+def _close_storage(writes: _WriteBuffer, conn: sqlite3.Connection) -> None:
+    try:
+        writes.close()
+    finally:
+        conn.close()
 
 
 class PlaybookStorage:
     def __init__(self, config: ACEConfig):
         self.config = config
         self._path = config.storage_path
+        # Serializes writers and embedding-cache swaps across worker threads.
+        self._lock = threading.RLock()
+        self._emb_ids: Optional[List[str]] = None
+        self._emb_index: Dict[str, int] = {}
+        self._emb_matrix: np.ndarray = np.empty((0, 0), dtype=np.float32)
+        self._emb_scales: Optional[np.ndarray] = None
+        self._features: Optional[FeatureColumns] = None
+        self._features_dirty = True
+        self._version = 0
+        # One long-lived connection (SQLite serializes access internally and
+        # ``_connect`` holds ``_lock``), so the page cache survives across calls.
+        self._conn = sqlite3.connect(
+            self._path,
+            check_same_thread=False,
+            cached_statements=256,
+            detect_types=sqlite3.PARSE_COLNAMES,
+        )
+        for pragma in _PRAGMAS:
+            self._conn.execute(pragma)
+        # Trace inserts and usage updates are queued here instead of committed inline.
+        self._writes = _WriteBuffer(self._conn, self._lock)
+        self._finalizer = weakref.finalize(self, _close_storage, self._writes, self._conn)
         self._ensure_schema()
 
     def _ensure_schema(self) -> None:
@@ -33,7 +384,7 @@ class PlaybookStorage:
                     helpful_count INTEGER DEFAULT 0,
                     harmful_count INTEGER DEFAULT 0,
                     score REAL DEFAULT 0,
-                    embedding TEXT,
+                    embedding BLOB,
                     source_trace_ids TEXT NOT NULL,
                     version INTEGER DEFAULT 0,
                     duplicate_of TEXT
@@ -72,15 +423,18 @@ class PlaybookStorage:
             conn.execute(
                 "CREATE INDEX IF NOT EXISTS idx_bullets_tags ON bullets(tags)"
             )
+            # No query reads bullets by (score, last_used_at), yet every usage update
+            # rewrote last_used_at and paid for that index's maintenance.
+            conn.execute("DROP INDEX IF EXISTS idx_bullets_score_last_used")
             conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_bullets_score_last_used ON bullets(score, last_used_at)"
+                "CREATE INDEX IF NOT EXISTS idx_traces_created_at ON traces(created_at DESC)"
             )
             self._run_migrations(conn)
             conn.commit()
 
     def _run_migrations(self, conn: sqlite3.Connection) -> None:
         info = {
-            row["name"]
+            row[1]  # column name
             for row in conn.execute("PRAGMA table_info(bullets)").fetchall()
         }
         if "version" not in info:
@@ -91,8 +445,17 @@ class PlaybookStorage:
             conn.execute(
                 "ALTER TABLE bullets ADD COLUMN duplicate_of TEXT"
             )
+        # Embeddings used to be JSON text; they are now raw float32 bytes.
+        legacy = conn.execute(
+            "SELECT id, embedding FROM bullets WHERE typeof(embedding) = 'text'"
+        ).fetchall()
+        if legacy:
+            conn.executemany(
+                "UPDATE bullets SET embedding=? WHERE id=?",
+                [(_encode_embedding(json_loads(text)), bullet_id) for bullet_id, text in legacy],
+            )
         trace_info = {
-            row["name"]
+            row[1]  # column name
             for row in conn.execute("PRAGMA table_info(traces)").fetchall()
         }
         if "used_bullet_ids" not in trace_info:
@@ -110,188 +473,523 @@ class PlaybookStorage:
 
     @contextmanager
     def _connect(self) -> Iterator[sqlite3.Connection]:
-        conn = sqlite3.connect(self._path)
-        conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-        finally:
-            conn.close()
+        with self._lock:
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.rollback()
+                raise
+
+    def close(self) -> None:
+        """Commit queued writes and close the connection (also done at GC or exit)."""
+
+        # Stop the writer before taking the lock it needs to finish its last batch.
+        self._writes.close()
+        with self._lock:
+            self._finalizer()
+
+    def flush(self) -> None:
+        """Commit queued trace and usage writes now; reads call this first."""
+
+        self._writes.flush()
 
     def upsert_bullets(self, bullets: Iterable[Bullet]) -> Tuple[int, int]:
+        bullets = list(bullets)
         added = 0
         updated = 0
-        with self._connect() as conn:
+        with self._lock, self._connect() as conn:
+            self._check_embedding_dims(bullets)
+            rows = [self._bullet_to_row(bullet) for bullet in bullets]
+            existing = self._existing_ids(conn, [bullet.id for bullet in bullets])
             for bullet in bullets:
-                payload = self._bullet_to_row(bullet)
-                exists = conn.execute(
-                    "SELECT 1 FROM bullets WHERE id=?",
-                    (payload["id"],),
-                ).fetchone()
-                conn.execute(
-                    f"REPLACE INTO bullets ({', '.join(payload.keys())}) VALUES ({', '.join(['?']*len(payload))})",
-                    list(payload.values()),
-                )
-                if exists:
+                if bullet.id in existing:
                     updated += 1
                 else:
                     added += 1
+                    existing.add(bullet.id)
+            if rows:
+                # One implicit transaction for the whole batch, committed once.
+                # ON CONFLICT updates in place instead of REPLACE's delete+insert.
+                conn.executemany(_SQL_UPSERT_BULLET, rows)
             conn.commit()
+            self._update_embedding_cache(bullets)
+            self._features_dirty = True
+            self._version += 1
         return added, updated
 
+    @staticmethod
+    def _existing_ids(conn: sqlite3.Connection, ids: Sequence[str]) -> Set[str]:
+        found: Set[str] = set()
+        unique = list(dict.fromkeys(ids))
+        for start in range(0, len(unique), _MAX_SQL_PARAMS):
+            chunk = unique[start : start + _MAX_SQL_PARAMS]
+            found.update(
+                row[0]
+                for row in conn.execute(
+                    f"SELECT id FROM bullets WHERE id IN ({_placeholders(len(chunk))})", chunk
+                )
+            )
+        return found
+
+    @property
+    def version(self) -> int:
+        """Counter bumped by every write that can change retrieval results."""
+
+        return self._version
+
     def get_bullet(self, bullet_id: str) -> Optional[Bullet]:
+        self.flush()
         with self._connect() as conn:
-            row = conn.execute("SELECT * FROM bullets WHERE id=?", (bullet_id,)).fetchone()
+            row = conn.execute(_SQL_SELECT_BULLET_BY_ID, (bullet_id,)).fetchone()
             if not row:
                 return None
             return self._row_to_bullet(row)
 
+    def get_bullets(self, bullet_ids: Iterable[str]) -> Dict[str, Bullet]:
+        """Fetch several bullets at once, keyed by id; unknown ids are omitted."""
+
+        ids = list(dict.fromkeys(bullet_ids))
+        found: Dict[str, Bullet] = {}
+        self.flush()
+        with self._connect() as conn:
+            for start in range(0, len(ids), _MAX_SQL_PARAMS):
+                chunk = ids[start : start + _MAX_SQL_PARAMS]
+                rows = conn.execute(
+                    f"{_SQL_SELECT_ALL_BULLETS} WHERE id IN ({_placeholders(len(chunk))})",
+                    chunk,
+                ).fetchall()
+                for row in rows:
+                    bullet = self._row_to_bullet(row)
+                    found[bullet.id] = bullet
+        return found
+
     def list_bullets(self) -> List[Bullet]:
+        self.flush()
         with self._connect() as conn:
-            rows = conn.execute("SELECT * FROM bullets").fetchall()
+            rows = conn.execute(_SQL_SELECT_ALL_BULLETS).fetchall()
             return [self._row_to_bullet(row) for row in rows]
 
-    def record_trace(self, trace: Trace) -> None:
-        payload = self._trace_to_row(trace)
+    def count_bullets_by_kind(self) -> Dict[str, int]:
+        self.flush()
         with self._connect() as conn:
-            conn.execute(
-                "INSERT OR REPLACE INTO traces (id, query, selected_bullet_ids, used_bullet_ids, misleading_bullet_ids, attribution_notes, prompt, response, success, metadata, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                (
-                    payload["id"],
-                    payload["query"],
-                    payload["selected_bullet_ids"],
-                    payload["used_bullet_ids"],
-                    payload["misleading_bullet_ids"],
-                    payload["attribution_notes"],
-                    payload["prompt"],
-                    payload["response"],
-                    payload["success"],
-                    payload["metadata"],
-                    payload["created_at"],
-                ),
-            )
-            conn.commit()
+            return dict(conn.execute(_SQL_COUNT_BULLETS_BY_KIND).fetchall())
+
+    def top_bullet_ids(self, limit: int) -> List[str]:
+        """Ids of the ``limit`` bullets with the best helpful-minus-harmful balance.
+
+        Ties go to the newest bullet; only the ranking columns are read.
+        """
+
+        self.flush()
+        with self._connect() as conn:
+            return [row[0] for row in conn.execute(_SQL_SELECT_TOP_BULLET_IDS, (limit,))]
+
+    def iter_bullets(self, batch_size: int = 512) -> Iterator[Bullet]:
+        """Yield all bullets, reading ``batch_size`` rows per query.
+
+        Pages are keyed on rowid and the connection is only held while a page is
+        read, so other threads can use the storage between pages.
+        """
+
+        self.flush()
+        last_rowid = -(2**63)
+        while True:
+            with self._connect() as conn:
+                rows = conn.execute(_SQL_SELECT_BULLET_PAGE, (last_rowid, batch_size)).fetchall()
+            for row in rows:
+                yield self._row_to_bullet(row[1:])
+            if len(rows) < batch_size:
+                return
+            last_rowid = rows[-1][0]
+
+    def record_trace(self, trace: Trace) -> None:
+        self.record_traces([trace])
+
+    def record_traces(self, traces: Iterable[Trace]) -> None:
+        """Queue ``traces`` for insertion; the background writer commits them in batches."""
+
+        self._writes.submit([(_SQL_INSERT_TRACE, [self._trace_to_row(trace) for trace in traces])])
 
     def list_traces(self, limit: int = 100) -> List[Trace]:
+        self.flush()
         with self._connect() as conn:
-            rows = conn.execute(
-                "SELECT * FROM traces ORDER BY datetime(created_at) DESC LIMIT ?",
-                (limit,),
-            ).fetchall()
+            rows = conn.execute(_SQL_SELECT_RECENT_TRACES, (limit,)).fetchall()
             return [self._row_to_trace(row) for row in rows]
 
     def update_usage(self, bullet_id: str, success: bool) -> None:
-        now = datetime.utcnow().isoformat()
+        self.update_usage_many([(bullet_id, success)])
+
+    def update_usage_many(self, updates: Iterable[Tuple[str, bool]]) -> None:
+        """Queue several ``(bullet_id, success)`` uses; cached features are patched now."""
+
+        updates = list(updates)
+        if not updates:
+            return
+        moment = _now()
+        now = moment.isoformat()
+        # Queue and patch under one lock so a concurrent feature rebuild (which
+        # flushes the queue) cannot observe the update twice.
+        with self._lock:
+            self._writes.submit(
+                [
+                    (_SQL_UPSERT_USAGE, [(bullet_id, now) for bullet_id, _ in updates]),
+                    (_SQL_MARK_HELPFUL, [(now, bullet_id) for bullet_id, ok in updates if ok]),
+                    (_SQL_MARK_HARMFUL, [(now, bullet_id) for bullet_id, ok in updates if not ok]),
+                ]
+            )
+            for bullet_id, success in updates:
+                self._patch_features(bullet_id, success, moment)
+            self._version += 1
+
+    def fetch_embeddings(self) -> Tuple[List[Bullet], np.ndarray]:
+        """Return embedded bullets and their L2-normalized float32 ``(N, D)`` matrix."""
+
+        ids, matrix = self.fetch_embedding_matrix()
+        self.flush()
+        # One scan over the embedded rows; Bullets are only built for cached ids.
         with self._connect() as conn:
-            row = conn.execute(
-                "SELECT total_uses FROM bullet_usage WHERE bullet_id=?",
-                (bullet_id,),
-            ).fetchone()
-            if row is None:
-                conn.execute(
-                    "INSERT INTO bullet_usage (bullet_id, total_uses, last_used_at) VALUES (?, ?, ?)",
-                    (bullet_id, 1, now),
-                )
-            else:
-                conn.execute(
-                    "UPDATE bullet_usage SET total_uses=total_uses+1, last_used_at=? WHERE bullet_id=?",
-                    (now, bullet_id),
-                )
-            if success:
-                conn.execute(
-                    "UPDATE bullets SET helpful_count=helpful_count+1, last_used_at=? WHERE id=?",
-                    (now, bullet_id),
-                )
-            else:
-                conn.execute(
-                    "UPDATE bullets SET harmful_count=harmful_count+1, last_used_at=? WHERE id=?",
-                    (now, bullet_id),
+            by_id = {row[0]: row for row in conn.execute(_SQL_SELECT_EMBEDDED_BULLETS)}
+        keep = [row for row, bullet_id in enumerate(ids) if bullet_id in by_id]
+        if len(keep) != len(ids):
+            # A concurrent prune removed rows after the cache snapshot was taken.
+            matrix = matrix[keep]
+        return [self._row_to_bullet(by_id[ids[row]]) for row in keep], matrix
+
+    def fetch_features(self) -> FeatureColumns:
+        """Return helpful/harmful/last-used columns aligned with the embedding cache.
+
+        Columns are rebuilt lazily after bullet writes or prunes; usage updates
+        patch them in place.
+        """
+
+        with self._lock:
+            self._load_embedding_cache()
+            features = self._features
+            if self._features_dirty or features is None or features.ids is not self._emb_ids:
+                ids = self._emb_ids
+                by_id = self.get_bullets(ids)
+                bullets = [by_id[bullet_id] for bullet_id in ids]
+                features = self._features = FeatureColumns(
+                    ids=ids,
+                    bullets=bullets,
+                    helpful=np.array([b.helpful_count for b in bullets], dtype=np.float32),
+                    harmful=np.array([b.harmful_count for b in bullets], dtype=np.float32),
+                    last_used=np.array(
+                        [_epoch_seconds(b.last_used_at) for b in bullets], dtype=np.int64
+                    ),
                 )
-            conn.commit()
+                self._features_dirty = False
+            return features
+
+    def _patch_features(self, bullet_id: str, success: bool, moment: datetime) -> None:
+        features = self._features
+        if self._features_dirty or features is None or features.ids is not self._emb_ids:
+            return
+        row = self._emb_index.get(bullet_id)
+        if row is None:
+            return
+        bullet = features.bullets[row]
+        if success:
+            bullet.helpful_count += 1
+            features.helpful[row] += 1
+        else:
+            bullet.harmful_count += 1
+            features.harmful[row] += 1
+        bullet.last_used_at = moment
+        features.last_used[row] = _epoch_seconds(moment)
+
+    def fetch_embedding_matrix(self) -> Tuple[List[str], np.ndarray]:
+        """Return bullet ids and their L2-normalized embeddings as one float32 matrix.
+
+        The matrix is loaded once and then maintained incrementally by
+        :meth:`upsert_bullets` and :meth:`prune_to_ids`; callers must treat it
+        as read-only. With int8 quantization a dequantized copy is returned.
+        """
+
+        with self._lock:
+            self._load_embedding_cache()
+            ids, matrix, scales = self._emb_ids, self._emb_matrix, self._emb_scales
+        if scales is None:
+            return ids, matrix
+        return ids, matrix.astype(np.float32) * scales[:, None]
 
-    def fetch_embeddings(self) -> Tuple[List[Bullet], List[List[float]]]:
-        bullets = self.list_bullets()
-        vectors: List[List[float]] = []
-        valid: List[Bullet] = []
+    @property
+    def embedding_dim(self) -> int:
+        """Width of the cached embedding matrix (0 while the playbook has no embeddings)."""
+
+        with self._lock:
+            self._load_embedding_cache()
+            return self._emb_matrix.shape[1]
+
+    def embedding_similarities(self, queries: np.ndarray) -> Tuple[List[str], np.ndarray]:
+        """Return stored ids and the ``(len(queries), n_stored)`` cosine similarities.
+
+        ``queries`` must be unit-normalized rows of :attr:`embedding_dim` width.
+        """
+
+        with self._lock:
+            self._load_embedding_cache()
+            ids, matrix, scales = self._emb_ids, self._emb_matrix, self._emb_scales
+        if scales is None:
+            return ids, queries @ matrix.T
+        # NumPy has no int8 GEMM, so dequantize in bounded blocks to keep the
+        # temporary float32 copy small.
+        sims = np.empty((queries.shape[0], len(ids)), dtype=np.float32)
+        for start in range(0, len(ids), _DEQUANT_BLOCK_ROWS):
+            block = slice(start, start + _DEQUANT_BLOCK_ROWS)
+            sims[:, block] = (queries @ matrix[block].astype(np.float32).T) * scales[block]
+        return ids, sims
+
+    def _load_embedding_cache(self) -> None:
+        if self._emb_ids is not None:
+            return
+        # Only ids and embedding bytes are needed; no Bullet objects are built.
+        with self._connect() as conn:
+            rows = conn.execute(_SQL_SELECT_EMBEDDINGS).fetchall()
+        sizes = Counter(len(row[1]) for row in rows)
+        if len(sizes) > 1:
+            # Rows written before dimensions were enforced: keep the majority width.
+            size = sizes.most_common(1)[0][0]
+            logger.warning(
+                "Ignoring %d stored embeddings whose dimension differs from %d",
+                len(rows) - sizes[size],
+                size // _FLOAT32_BYTES,
+            )
+            rows = [row for row in rows if len(row[1]) == size]
+        # One join and one frombuffer for the whole (N, D) matrix.
+        matrix = np.frombuffer(b"".join(row[1] for row in rows), dtype=np.float32)
+        matrix, scales = self._encode_embeddings(matrix.reshape(len(rows), -1) if rows else [])
+        self._set_embedding_cache([row[0] for row in rows], matrix, scales)
+
+    def _check_embedding_dims(self, bullets: List[Bullet]) -> None:
+        dim = self.embedding_dim
         for bullet in bullets:
-            if not bullet.embedding:
+            if bullet.embedding is None:
                 continue
-            vector = [float(x) for x in bullet.embedding]
-            if not vector:
-                continue
-            vectors.append(vector)
-            valid.append(bullet)
-        return valid, vectors
+            if not dim:
+                dim = len(bullet.embedding)
+            elif len(bullet.embedding) != dim:
+                raise ValueError(
+                    f"Bullet {bullet.id} has a {len(bullet.embedding)}-dim embedding but the "
+                    f"playbook stores {dim}-dim embeddings; re-embed it with the same model"
+                )
+
+    def _encode_embeddings(
+        self, vectors: Sequence[Sequence[float]]
+    ) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        quantize = self.config.embedding_quantization == "int8"
+        if not len(vectors):
+            if quantize:
+                return np.empty((0, 0), dtype=np.int8), np.empty(0, dtype=np.float32)
+            return np.empty((0, 0), dtype=np.float32), None
+        rows = normalize_rows(vectors)
+        if not quantize:
+            return rows, None
+        peak = np.abs(rows).max(axis=1)
+        peak[peak == 0] = 1.0
+        scales = (peak / 127.0).astype(np.float32)
+        return np.rint(rows / scales[:, None]).astype(np.int8), scales
+
+    def _set_embedding_cache(
+        self, ids: List[str], matrix: np.ndarray, scales: Optional[np.ndarray]
+    ) -> None:
+        self._emb_ids = ids
+        self._emb_index = {bullet_id: row for row, bullet_id in enumerate(ids)}
+        self._emb_matrix = matrix
+        self._emb_scales = scales
+
+    def _update_embedding_cache(self, bullets: List[Bullet]) -> None:
+        if self._emb_ids is None:
+            return
+        changed: Dict[str, Optional[np.ndarray]] = {
+            bullet.id: bullet.embedding for bullet in bullets
+        }
+        replaced = {
+            self._emb_index[bullet_id]: vector
+            for bullet_id, vector in changed.items()
+            if vector is not None and bullet_id in self._emb_index
+        }
+        if replaced:
+            rows = list(replaced)
+            encoded, scales = self._encode_embeddings([replaced[row] for row in rows])
+            self._emb_matrix[rows] = encoded
+            if scales is not None:
+                self._emb_scales[rows] = scales
+        added = [
+            (bullet_id, vector)
+            for bullet_id, vector in changed.items()
+            if vector is not None and bullet_id not in self._emb_index
+        ]
+        ids, matrix, scales = self._emb_ids, self._emb_matrix, self._emb_scales
+        if added:
+            new_rows, new_scales = self._encode_embeddings([vector for _, vector in added])
+            matrix = np.vstack([matrix, new_rows]) if ids else new_rows
+            if scales is not None:
+                scales = np.concatenate([scales, new_scales])
+            ids = ids + [bullet_id for bullet_id, _ in added]
+        dropped = {
+            bullet_id
+            for bullet_id, vector in changed.items()
+            if vector is None and bullet_id in self._emb_index
+        }
+        if dropped:
+            self._set_embedding_cache(ids, matrix, scales)
+            self._retain_embeddings(lambda bullet_id: bullet_id not in dropped)
+        elif added:
+            self._set_embedding_cache(ids, matrix, scales)
+
+    def _retain_embeddings(self, predicate: Callable[[str], bool]) -> None:
+        mask = np.array([predicate(bullet_id) for bullet_id in self._emb_ids], dtype=bool)
+        self._set_embedding_cache(
+            [bullet_id for bullet_id, keep in zip(self._emb_ids, mask, strict=True) if keep],
+            self._emb_matrix[mask],
+            self._emb_scales[mask] if self._emb_scales is not None else None,
+        )
+
+    def patch_bullets(
+        self, counts: Mapping[str, Tuple[int, int]], bodies: Mapping[str, str]
+    ) -> None:
+        """Add ``(helpful, harmful)`` increments and replace bodies in one transaction."""
+
+        if not counts and not bodies:
+            return
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                _SQL_ADD_COUNTS,
+                [(helpful, harmful, bullet_id) for bullet_id, (helpful, harmful) in counts.items()],
+            )
+            conn.executemany(_SQL_SET_BODY, [(body, bullet_id) for bullet_id, body in bodies.items()])
+            conn.commit()
+            self._features_dirty = True
+            self._version += 1
 
     def prune_to_ids(self, keep_ids: List[str]) -> None:
-        with self._connect() as conn:
+        with self._lock, self._connect() as conn:
             if keep_ids:
-                placeholders = ",".join(["?"] * len(keep_ids))
-                conn.execute(
-                    f"DELETE FROM bullets WHERE id NOT IN ({placeholders})",
-                    keep_ids,
-                )
+                conn.execute(_SQL_CREATE_KEEP_IDS)
+                conn.executemany(_SQL_INSERT_KEEP_ID, ((bullet_id,) for bullet_id in keep_ids))
+                conn.execute(_SQL_DELETE_NOT_KEPT)
+                conn.execute(_SQL_DROP_KEEP_IDS)
             else:
                 conn.execute("DELETE FROM bullets")
             conn.commit()
+            self._features_dirty = True
+            self._version += 1
+            if self._emb_ids is not None:
+                keep = set(keep_ids)
+                self._retain_embeddings(keep.__contains__)
 
-    def _bullet_to_row(self, bullet: Bullet) -> Dict[str, object]:
-        return {
-            "id": bullet.id,
-            "kind": bullet.kind,
-            "title": bullet.title,
-            "body": bullet.body,
-            "tags": json.dumps(bullet.tags),
-            "created_at": bullet.created_at.isoformat(),
-            "last_used_at": bullet.last_used_at.isoformat() if bullet.last_used_at else None,
-            "helpful_count": bullet.helpful_count,
-            "harmful_count": bullet.harmful_count,
-            "score": bullet.score,
-            "embedding": json.dumps(bullet.embedding) if bullet.embedding else None,
-            "source_trace_ids": json.dumps(bullet.source_trace_ids),
-            "version": bullet.version,
-            "duplicate_of": bullet.duplicate_of,
-        }
+    def _bullet_to_row(self, bullet: Bullet) -> Tuple:
+        return (
+            bullet.id,
+            bullet.kind,
+            bullet.title,
+            bullet.body,
+            json_dumps(bullet.tags),
+            _utc_isoformat(bullet.created_at),
+            _utc_isoformat(bullet.last_used_at) if bullet.last_used_at else None,
+            bullet.helpful_count,
+            bullet.harmful_count,
+            bullet.score,
+            _encode_embedding(bullet.embedding),
+            json_dumps(bullet.source_trace_ids),
+            bullet.version,
+            bullet.duplicate_of,
+        )
 
-    def _row_to_bullet(self, row: sqlite3.Row) -> Bullet:
-        data = dict(row)
-        data["tags"] = json.loads(data["tags"])
-        data["source_trace_ids"] = json.loads(data["source_trace_ids"])
-        if data.get("embedding"):
-            data["embedding"] = json.loads(data["embedding"])
-        if data.get("created_at"):
-            data["created_at"] = datetime.fromisoformat(data["created_at"])
-        if data.get("last_used_at"):
-            data["last_used_at"] = datetime.fromisoformat(data["last_used_at"])
-        if data.get("duplicate_of") is None:
-            data["duplicate_of"] = None
-        return Bullet.from_dict(data)
-
-    def _trace_to_row(self, trace: Trace) -> Dict[str, object]:
-        return {
-            "id": trace.id,
-            "query": trace.query,
-            "selected_bullet_ids": json.dumps(trace.selected_bullet_ids),
-            "used_bullet_ids": json.dumps(trace.used_bullet_ids),
-            "misleading_bullet_ids": json.dumps(trace.misleading_bullet_ids),
-            "attribution_notes": json.dumps(trace.attribution_notes),
-            "prompt": trace.prompt,
-            "response": trace.response,
-            "success": 1 if trace.success else 0,
-            "metadata": json.dumps(trace.metadata),
-            "created_at": trace.created_at.isoformat(),
-        }
+    def _row_to_bullet(self, row: Tuple) -> Bullet:
+        (
+            bullet_id,
+            kind,
+            title,
+            body,
+            tags,
+            created_at,
+            last_used_at,
+            helpful_count,
+            harmful_count,
+            score,
+            embedding,
+            source_trace_ids,
+            version,
+            duplicate_of,
+        ) = row
+        # Bodies were validated on write.
+        with trusted_load():
+            return Bullet(
+                kind=_LITERALS.get(kind, kind),
+                title=title,
+                body=body,
+                tags=tags,
+                id=bullet_id,
+                created_at=created_at,
+                last_used_at=last_used_at,
+                helpful_count=helpful_count,
+                harmful_count=harmful_count,
+                score=score,
+                embedding=embedding,
+                source_trace_ids=source_trace_ids,
+                version=version,
+                duplicate_of=duplicate_of,
+            )
+
+    def _trace_to_row(self, trace: Trace) -> Tuple:
+        # Rejected here so the caller sees the error, not the background writer.
+        for name in ("id", "query", "prompt", "response"):
+            if not isinstance(getattr(trace, name), str):
+                raise ValueError(f"trace {name} must be a string")
+        return (
+            trace.id,
+            trace.query,
+            json_dumps(trace.selected_bullet_ids),
+            json_dumps(trace.used_bullet_ids),
+            json_dumps(trace.misleading_bullet_ids),
+            json_dumps(trace.attribution_notes),
+            trace.prompt,
+            trace.response,
+            int(trace.success),
+            json_dumps(trace.metadata),
+            _utc_isoformat(trace.created_at),
+        )
+
+    def _row_to_trace(self, row: Tuple) -> Trace:
+        (
+            trace_id,
+            query,
+            selected_bullet_ids,
+            used_bullet_ids,
+            misleading_bullet_ids,
+            attribution_notes,
+            prompt,
+            response,
+            success,
+            metadata,
+            created_at,
+        ) = row
+        return Trace(
+            query=query,
+            selected_bullet_ids=selected_bullet_ids,
+            prompt=prompt,
+            response=response,
+            # Trace.success is a real bool so to_dict/JSON exports keep true/false.
+            success=bool(success),
+            metadata=metadata,
+            used_bullet_ids=used_bullet_ids,
+            misleading_bullet_ids=misleading_bullet_ids,
+            attribution_notes=attribution_notes,
+            id=trace_id,
+            created_at=created_at,
+        )
+
+
+def dump_playbook(storage: PlaybookStorage) -> Iterator[Dict[str, object]]:
+    """Yield each bullet as a dict, paging through the database lazily."""
+
+    for bullet in storage.iter_bullets():
+        yield bullet.to_dict()
 
-    def _row_to_trace(self, row: sqlite3.Row) -> Trace:
-        data = dict(row)
-        data["selected_bullet_ids"] = json.loads(data["selected_bullet_ids"])
-        data["used_bullet_ids"] = json.loads(data.get("used_bullet_ids", "[]"))
-        data["misleading_bullet_ids"] = json.loads(data.get("misleading_bullet_ids", "[]"))
-        data["attribution_notes"] = json.loads(data.get("attribution_notes", "{}"))
-        data["metadata"] = json.loads(data["metadata"])
-        data["success"] = bool(data["success"])
-        data["created_at"] = datetime.fromisoformat(data["created_at"])
-        return Trace.from_dict(data)
 
+def dump_playbook_jsonl(storage: PlaybookStorage, path: Path) -> int:
+    """Write one bullet per line, streaming from the database; returns the count."""
 
-def dump_playbook(storage: PlaybookStorage) -> List[Dict[str, object]]:
-    return [bullet.to_dict() for bullet in storage.list_bullets()]
+    return dump_jsonl(path, dump_playbook(storage))
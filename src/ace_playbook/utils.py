@@ -4,8 +4,16 @@ from __future__ import annotations
 
 import json
 import logging
+from dataclasses import fields, is_dataclass
+from datetime import date, datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+try:  # pragma: no cover - optional dependency
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
 
 try:  # pragma: no cover - optional dependency
     from rich.console import Console
@@ -21,6 +29,7 @@ logger = logging.getLogger(__name__)
 PROMPT_DIR = Path(__file__).parent / "prompts"
 
 
+@lru_cache(maxsize=32)
 def load_prompt_template(name: str) -> str:
     path = PROMPT_DIR / name
     if not path.exists():
@@ -28,15 +37,84 @@ def load_prompt_template(name: str) -> str:
     return path.read_text(encoding="utf-8").strip()
 
 
+def _json_default(obj: Any) -> Any:
+    # Mirror orjson's native handling of dataclasses and datetimes.
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return {f.name: getattr(obj, f.name) for f in fields(obj)}
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def json_dumps(obj: Any) -> str:
+    """Serialize ``obj`` to a compact JSON string, using orjson when installed.
+
+    Dataclasses and datetimes are serialized directly (ISO 8601 timestamps).
+    """
+
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, default=_json_default)
+
+
+def json_dumps_bytes(obj: Any) -> bytes:
+    """Serialize ``obj`` to compact UTF-8 JSON bytes (e.g. for an HTTP body)."""
+
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, default=_json_default).encode("utf-8")
+
+
+def json_dumps_pretty(obj: Any) -> bytes:
+    """Serialize ``obj`` to UTF-8 JSON bytes indented by two spaces (for files on disk)."""
+
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False, default=_json_default).encode("utf-8")
+
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """Parse JSON text; raises ``json.JSONDecodeError`` (or a subclass) on bad input."""
+
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 def ensure_directory(path: Path) -> Path:
     path.mkdir(parents=True, exist_ok=True)
     return path
 
 
-def dump_jsonl(path: Path, items: Iterable[Dict[str, Any]]) -> None:
-    with path.open("w", encoding="utf-8") as fh:
+_JSONL_CHUNK_BYTES = 1 << 20
+
+
+def _json_line(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    return json_dumps_bytes(obj) + b"\n"
+
+
+def dump_jsonl(path: Path, items: Iterable[Dict[str, Any]]) -> int:
+    """Write ``items`` as JSON lines, handing the file ~1 MiB chunks at a time.
+
+    Chunks larger than the file buffer go straight to the OS, so a large export
+    costs a handful of writes instead of one buffered write per line. Returns
+    the number of lines written.
+    """
+
+    buf = bytearray()
+    count = 0
+    with path.open("wb") as fh:
         for item in items:
-            fh.write(json.dumps(item, ensure_ascii=False) + "\n")
+            buf += _json_line(item)
+            count += 1
+            if len(buf) >= _JSONL_CHUNK_BYTES:
+                fh.write(buf)
+                buf.clear()
+        if buf:
+            fh.write(buf)
+    return count
 
 
 def render_bullets_table(bullets: Iterable[Dict[str, Any]]) -> None:
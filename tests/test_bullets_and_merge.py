@@ -1,10 +1,31 @@
 from __future__ import annotations
 
+import json
+import sys
+from dataclasses import fields
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
 from ace_playbook.config import ACEConfig
 from ace_playbook.curator import Curator
 from ace_playbook.embeddings import BaseEmbeddings, EmbeddingResult
-from ace_playbook.schemas import Bullet, DeltaRuntime
-from ace_playbook.storage import PlaybookStorage
+from ace_playbook.schemas import (
+    Bullet,
+    BulletPatch,
+    BulletSchema,
+    ContextSlice,
+    DeltaRuntime,
+    MergeReport,
+    Trace,
+    cosine_similarity,
+    cosine_similarity_matrix,
+    parse_delta,
+    trusted_load,
+)
+from ace_playbook.storage import PlaybookStorage, _epoch_seconds
 
 
 class StubEmbeddings(BaseEmbeddings):
@@ -24,3 +45,171 @@ def test_curator_deduplicates(tmp_path):
     report = curator.merge(delta)
     assert report.added == 1
     assert report.deduplicated >= 1
+
+
+def test_curator_rejects_duplicates_of_stored_bullets(tmp_path):
+    config = ACEConfig(storage_path=tmp_path / "db.sqlite", dedup_cosine_threshold=0.9)
+    storage = PlaybookStorage(config)
+    curator = Curator(config, storage, StubEmbeddings())
+    curator.merge(DeltaRuntime(bullets=[Bullet(kind="rule", title="First", body="Check units")]))
+    report = curator.merge(DeltaRuntime(bullets=[Bullet(kind="rule", title="Second", body="Check units")]))
+    assert report.added == 0
+    assert report.deduplicated == 1
+    assert len(storage.list_bullets()) == 1
+
+
+def test_curator_applies_patches_in_bulk(tmp_path):
+    config = ACEConfig(storage_path=tmp_path / "db.sqlite")
+    storage = PlaybookStorage(config)
+    curator = Curator(config, storage, StubEmbeddings())
+    bullet = Bullet(kind="rule", title="Units", body="Check units", embedding=[1, 0])
+    storage.upsert_bullets([bullet])
+    patches = [
+        BulletPatch(bullet_id=bullet.id, op="inc_helpful"),
+        BulletPatch(bullet_id=bullet.id, op="patch", patch_text="Also check signs."),
+        BulletPatch(bullet_id="missing", op="inc_harmful"),
+    ]
+    report = curator.merge(DeltaRuntime(patches=patches))
+    assert report.updated == 1
+    stored = storage.get_bullet(bullet.id)
+    assert stored.helpful_count == 1
+    assert stored.body == "Check units\nAlso check signs."
+
+
+def test_patch_counters_do_not_overwrite_concurrent_usage_updates(tmp_path, monkeypatch):
+    config = ACEConfig(storage_path=tmp_path / "db.sqlite")
+    storage = PlaybookStorage(config)
+    curator = Curator(config, storage, StubEmbeddings())
+    bullet = Bullet(kind="rule", title="Units", body="Check units", embedding=[1, 0])
+    storage.upsert_bullets([bullet])
+    get_bullets = storage.get_bullets
+
+    def get_then_record_usage(ids):
+        stored = get_bullets(ids)
+        # Another worker records a use after the curator has read the bullet.
+        storage.update_usage_many([(bullet.id, True)])
+        storage.flush()
+        return stored
+
+    monkeypatch.setattr(storage, "get_bullets", get_then_record_usage)
+    curator.merge(DeltaRuntime(patches=[BulletPatch(bullet_id=bullet.id, op="inc_helpful")]))
+    monkeypatch.undo()
+    assert storage.get_bullet(bullet.id).helpful_count == 2
+
+
+def test_cosine_similarity_matrix_matches_pairwise():
+    rows = [[1.0, 1.0], [0.0, 0.0], [2.0, 0.0], [-1.0, 0.5]]
+    sims = cosine_similarity_matrix([1.0, 0.0], rows)
+    expected = [cosine_similarity([1.0, 0.0], row) for row in rows]
+    assert sims.tolist() == pytest.approx(expected, abs=1e-6)
+
+
+def test_bullet_embedding_is_float32_array_with_list_boundaries():
+    bullet = Bullet(kind="rule", title="Vec", body="Store vectors", embedding=[1, 2])
+    assert isinstance(bullet.embedding, np.ndarray) and bullet.embedding.dtype == np.float32
+    assert bullet.to_dict()["embedding"] == [1.0, 2.0]
+    assert BulletSchema.from_runtime(bullet).embedding == [1.0, 2.0]
+    assert Bullet.from_dict(bullet.to_dict()).embedding.tolist() == [1.0, 2.0]
+    assert Bullet(kind="rule", title="E", body="Empty", embedding=[]).embedding is None
+
+
+def test_bullets_with_embeddings_compare_by_value():
+    created = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    def make(embedding):
+        return Bullet(
+            kind="rule", title="Vec", body="Do", id="b1", created_at=created, embedding=embedding
+        )
+
+    assert make([1, 2]) == make([1.0, 2.0])
+    assert make([1, 2]) != make([1, 3])
+    assert make([1, 2]) != make(None)
+    assert make(None) == make(None)
+
+
+def test_to_dict_covers_every_dataclass_field():
+    bullet = Bullet(kind="rule", title="T", body="Body", tags=["a"])
+    trace = Trace(query="q", selected_bullet_ids=["b"], prompt="p", response="r", success=True)
+    patch = BulletPatch(bullet_id="b", op="inc_helpful")
+    report = MergeReport(added=1, updated=0, skipped=0, deduplicated=0)
+    for item in (bullet, trace, patch, report):
+        assert list(item.to_dict()) == [f.name for f in fields(item)]
+    payload = bullet.to_dict()
+    payload["tags"].append("b")
+    assert bullet.tags == ["a"]
+    assert Bullet.from_dict(bullet.to_dict()) == bullet
+    assert Trace.from_dict(trace.to_dict()) == trace
+    delta = DeltaRuntime(bullets=[bullet], patches=[patch], traces=[trace])
+    assert delta.to_dict()["patches"] == [patch.to_dict()]
+
+
+def test_runtime_dataclasses_use_slots():
+    bullet = Bullet(kind="rule", title="T", body="Body")
+    assert not hasattr(bullet, "__dict__")
+    with pytest.raises(AttributeError):
+        bullet.unknown = 1  # type: ignore[attr-defined]
+
+
+def test_delta_schema_round_trip_preserves_bullets():
+    bullet = Bullet(kind="rule", title="T", body="Body", tags=["a"], embedding=[0.5, 0.25])
+    delta = DeltaRuntime(bullets=[bullet], patches=[BulletPatch(bullet_id="b", op="patch")])
+    restored = delta.to_schema().to_runtime()
+    assert restored.bullets[0].to_dict() == bullet.to_dict()
+    assert restored.patches == delta.patches
+
+
+def test_parse_delta_accepts_json_and_mappings():
+    payload = {"bullets": [{"kind": "rule", "title": "T", "body": "Body"}], "patches": []}
+    from_mapping = parse_delta(payload)
+    from_json = parse_delta('{"bullets": [{"kind": "rule", "title": "T", "body": "Body"}]}')
+    assert isinstance(from_mapping, DeltaRuntime)
+    assert from_json.bullets[0].title == from_mapping.bullets[0].title == "T"
+    with pytest.raises(ValidationError):
+        parse_delta({"bullets": [{"kind": "nope", "title": "T", "body": "Body"}]})
+
+
+def test_context_slice_prompt_fragment_labels_kinds():
+    bullets = [
+        Bullet(kind="rule", title="A", body="First"),
+        Bullet(kind="pitfall", title="B", body="Second"),
+    ]
+    fragment = ContextSlice(bullets=bullets).to_prompt_fragment()
+    assert fragment == "- [RULE] A: First\n- [PITFALL] B: Second"
+    assert ContextSlice(bullets=[]).to_prompt_fragment() == ""
+
+
+def test_timestamps_are_utc_aware_and_naive_inputs_are_read_as_utc():
+    bullet = Bullet(kind="rule", title="T", body="Body")
+    assert bullet.created_at.tzinfo is timezone.utc
+    legacy = Bullet.from_dict({**bullet.to_dict(), "created_at": "2024-01-02T03:04:05"})
+    assert legacy.created_at == datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    assert _epoch_seconds(datetime(1970, 1, 2)) == 86400
+    assert _epoch_seconds(legacy.created_at) == _epoch_seconds(datetime(2024, 1, 2, 3, 4, 5))
+
+
+def test_decoded_literals_are_interned():
+    raw = json.loads(json.dumps(Bullet(kind="pitfall", title="T", body="Body").to_dict()))
+    assert Bullet.from_dict(raw).kind is sys.intern("pitfall")
+    delta = parse_delta('{"patches": [{"bullet_id": "b", "op": "inc_harmful"}]}')
+    assert delta.patches[0].op is sys.intern("inc_harmful")
+
+
+def test_trusted_load_skips_body_revalidation():
+    with pytest.raises(ValueError):
+        Bullet(kind="rule", title="T", body="run curl https://example.com")
+    with trusted_load():
+        bullet = Bullet(kind="rule", title="T", body="run curl https://example.com")
+    assert bullet.body == "run curl https://example.com"
+    with pytest.raises(ValueError):
+        Bullet(kind="rule", title="T", body="run curl https://example.com")
+
+
+def test_from_dict_reads_without_mutating_and_fills_defaults():
+    data = {"kind": "rule", "title": "T", "body": "Body", "created_at": "2024-01-02T03:04:05"}
+    bullet = Bullet.from_dict(data)
+    assert data["created_at"] == "2024-01-02T03:04:05"
+    assert bullet.tags == [] and bullet.id and bullet.helpful_count == 0
+    trace = Trace.from_dict(
+        {"query": "q", "selected_bullet_ids": [], "prompt": "p", "response": "r", "success": 1}
+    )
+    assert trace.used_bullet_ids == [] and trace.attribution_notes == {}
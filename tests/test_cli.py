@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import inspect
+
+from cli.ace_online import _load_episodes, rollout
+
+
+def test_load_episodes_ignores_late_type_changes_in_unused_columns(tmp_path):
+    path = tmp_path / "episodes.csv"
+    rows = [f"{idx},q{idx},a{idx}" for idx in range(70_000)] + ["abc,last,final"]
+    path.write_text("id,question,answer\n" + "\n".join(rows) + "\n", encoding="utf-8")
+    episodes = list(_load_episodes(path))
+    assert len(episodes) == 70_001
+    assert (episodes[0].query, episodes[0].answer) == ("q0", "a0")
+    assert (episodes[-1].query, episodes[-1].answer) == ("last", "final")
+
+
+def test_load_episodes_defaults_missing_columns(tmp_path):
+    path = tmp_path / "episodes.csv"
+    path.write_text("question\nwhat?\n", encoding="utf-8")
+    [episode] = _load_episodes(path)
+    assert (episode.query, episode.answer) == ("what?", None)
+
+
+def test_rollout_defaults_to_sequential_episodes():
+    params = inspect.signature(rollout).parameters
+    assert params["batch_size"].default.default == 1
+    assert params["workers"].default.default == 1
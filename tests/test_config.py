@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from ace_playbook.config import ACEConfig
+
+
+def test_from_env_casts_values(monkeypatch):
+    monkeypatch.setenv("ACE_TEMPERATURE", "0.5")
+    monkeypatch.setenv("ACE_RETRIEVAL_TOP_K", "3")
+    monkeypatch.setenv("ACE_STORAGE_PATH", "playbook.sqlite")
+    config = ACEConfig.from_env(model="local-model")
+    assert config.temperature == 0.5
+    assert config.retrieval_top_k == 3
+    assert config.storage_path == Path("playbook.sqlite")
+    assert config.model == "local-model"
+
+    monkeypatch.setenv("ACE_RETRIEVAL_TOP_K", "5")
+    assert ACEConfig.from_env().retrieval_top_k == 5
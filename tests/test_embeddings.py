@@ -1,5 +1,10 @@
 from __future__ import annotations
 
+import threading
+
+import numpy as np
+import pytest
+
 from ace_playbook.config import ACEConfig
 from ace_playbook.embeddings import (
     EmbeddingError,
@@ -7,13 +12,25 @@ from ace_playbook.embeddings import (
     OpenAIEmbeddings,
     build_embedding_provider,
 )
+from ace_playbook.llm_client import ChatClient
 
 
 def test_hash_fallback_deterministic():
     embedder = LocalEmbeddings()
     vec1 = embedder.embed_texts(["hello"]).vectors
     vec2 = embedder.embed_texts(["hello"]).vectors
-    assert vec1 == vec2
+    assert vec1.shape == (1, 128)
+    assert np.array_equal(vec1, vec2)
+
+
+def test_hash_fallback_is_stable_across_processes_and_batches():
+    embedder = LocalEmbeddings()
+    batch = embedder.embed_texts(["hello", "world"]).vectors
+    assert batch.dtype == np.float32
+    assert np.array_equal(batch[0], embedder.embed_texts(["hello"]).vectors[0])
+    # Seeded from blake2b rather than hash(), so the values do not depend on PYTHONHASHSEED.
+    assert batch[0, :3] == pytest.approx([0.340007, -0.83969074, -0.419922], abs=1e-6)
+    assert np.all((batch >= -1.0) & (batch < 1.0))
 
 
 def test_build_embedding_provider(monkeypatch):
@@ -29,3 +46,46 @@ def test_build_embedding_provider(monkeypatch):
     provider = build_embedding_provider(config)
     vectors = provider.embed_texts(["test"]).vectors
     assert len(vectors) == 1
+
+
+def test_build_embedding_provider_caches_health_check(monkeypatch):
+    config = ACEConfig(embedding_base_url="https://health-cache.invalid/v1")
+    calls = []
+
+    class Dummy(OpenAIEmbeddings):
+        def embed_texts(self, texts):
+            calls.append(texts)
+            return None
+
+    from ace_playbook import embeddings as emb_module
+
+    monkeypatch.setattr(emb_module, "OpenAIEmbeddings", Dummy)
+    monkeypatch.setattr(emb_module, "_HEALTH_CACHE", {})
+    assert isinstance(build_embedding_provider(config), Dummy)
+    assert isinstance(build_embedding_provider(config), Dummy)
+    assert len(calls) == 1
+
+
+def test_openai_single_text_calls_from_threads_share_a_request(monkeypatch):
+    calls = []
+
+    async def _fake_embeddings(self, texts, **kwargs):
+        calls.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+    monkeypatch.setattr(ChatClient, "embeddings", _fake_embeddings)
+    embedder = OpenAIEmbeddings(ACEConfig(embedding_batch_window_ms=200))
+    results = {}
+    start = threading.Barrier(4)
+
+    def _embed(n):
+        start.wait()
+        results[n] = embedder.embed_texts(["x" * n]).vectors
+
+    threads = [threading.Thread(target=_embed, args=(n,)) for n in range(1, 5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == {n: [[float(n)]] for n in range(1, 5)}
+    assert len(calls) == 1
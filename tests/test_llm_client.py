@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import httpx
+
+from ace_playbook.config import ACEConfig
+from ace_playbook.llm_client import ChatClient, LLMError, SyncChatClient
+
+
+def test_alternate_base_url_clients_are_pooled():
+    config = ACEConfig(pool_max_connections=7, pool_max_keepalive=3)
+
+    async def _run():
+        client = ChatClient(config)
+        first = client._get_client("https://embeddings.invalid/v1")
+        second = client._get_client("https://embeddings.invalid/v1")
+        other = client._get_client("https://other.invalid/v1")
+        await client.aclose()
+        return first, second, other, client
+
+    first, second, other, client = asyncio.run(_run())
+    assert first is second
+    assert other is not first
+    assert first.is_closed and client._client.is_closed
+    assert not client._alt_clients
+
+
+def test_embed_one_coalesces_concurrent_calls(monkeypatch):
+    config = ACEConfig(embedding_batch_size=8, embedding_batch_window_ms=20)
+    calls = []
+
+    async def _fake_embeddings(self, texts, **kwargs):
+        calls.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+    monkeypatch.setattr(ChatClient, "embeddings", _fake_embeddings)
+
+    async def _run():
+        client = ChatClient(config)
+        try:
+            return await asyncio.gather(*(client.embed_one("x" * n) for n in range(1, 6)))
+        finally:
+            await client.aclose()
+
+    vectors = asyncio.run(_run())
+    assert vectors == [[1.0], [2.0], [3.0], [4.0], [5.0]]
+    assert len(calls) == 1
+
+
+def test_aclose_fails_pending_embed_one_callers(monkeypatch):
+    config = ACEConfig(embedding_batch_size=1, embedding_batch_window_ms=0)
+
+    async def _stuck_embeddings(self, texts, **kwargs):
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(ChatClient, "embeddings", _stuck_embeddings)
+
+    async def _run():
+        client = ChatClient(config)
+        # The first text is in flight; the second is still queued.
+        pending = [asyncio.ensure_future(client.embed_one(text)) for text in ("a", "b")]
+        await asyncio.sleep(0.01)
+        await client.aclose()
+        return await asyncio.wait_for(
+            asyncio.gather(*pending, return_exceptions=True), timeout=1
+        )
+
+    results = asyncio.run(_run())
+    assert [type(result) for result in results] == [LLMError, LLMError]
+
+
+def test_embed_many_fans_out_bounded_batches_in_order(monkeypatch):
+    config = ACEConfig(embedding_batch_size=2, embedding_max_concurrency=2, embedding_jitter_ms=0)
+    calls = []
+    in_flight = 0
+    peak = 0
+
+    async def _fake_embeddings(self, texts, **kwargs):
+        nonlocal in_flight, peak
+        calls.append(list(texts))
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return [[float(len(text))] for text in texts]
+
+    monkeypatch.setattr(ChatClient, "embeddings", _fake_embeddings)
+
+    async def _run():
+        client = ChatClient(config)
+        try:
+            return await client.embed_many(["x" * n for n in range(1, 8)])
+        finally:
+            await client.aclose()
+
+    vectors = asyncio.run(_run())
+    assert vectors == [[float(n)] for n in range(1, 8)]
+    assert sorted(len(call) for call in calls) == [1, 2, 2, 2]
+    assert peak == 2
+
+
+def test_sync_client_reuses_async_client_on_shared_loop(monkeypatch):
+    loops = []
+
+    async def _fake_chat(self, messages, **kwargs):
+        loops.append((id(self), asyncio.get_running_loop()))
+        return {"choices": []}
+
+    monkeypatch.setattr(ChatClient, "chat", _fake_chat)
+    client = SyncChatClient(ACEConfig())
+    client.chat([{"role": "user", "content": "a"}])
+    client.chat([{"role": "user", "content": "b"}])
+    other = SyncChatClient(ACEConfig())
+    other.chat([{"role": "user", "content": "c"}])
+    assert loops[0] == loops[1]
+    assert loops[2] == loops[0]
+    SyncChatClient(ACEConfig(model="other")).chat([{"role": "user", "content": "d"}])
+    assert loops[3][1] is loops[0][1]
+    assert loops[3][0] != loops[0][0]
+
+
+def test_chat_stream_stops_at_closing_brace():
+    chunks = ['{"bullets": [{"body": "use {x}', ' and \\"}\\""}]', ', "patches": []}', " trailing"]
+    events = [f"data: {json.dumps({'choices': [{'delta': {'content': c}}]})}\n\n" for c in chunks]
+    body = "".join(events) + "data: [DONE]\n\n"
+
+    def handler(request):
+        assert "Content-Encoding" not in request.headers
+        assert json.loads(request.content)["stream"] is True
+        return httpx.Response(200, text=body, headers={"Content-Type": "text/event-stream"})
+
+    async def _run():
+        client = ChatClient(ACEConfig())
+        await client._client.aclose()
+        client._client = httpx.AsyncClient(
+            base_url="https://llm.invalid/v1", transport=httpx.MockTransport(handler)
+        )
+        try:
+            return await client.chat_stream([{"role": "user", "content": "hi"}])
+        finally:
+            await client.aclose()
+
+    content = asyncio.run(_run())["choices"][0]["message"]["content"]
+    assert json.loads(content) == {"bullets": [{"body": 'use {x} and "}"'}], "patches": []}
+
+
+def test_large_request_bodies_are_gzipped():
+    import gzip
+
+    client = ChatClient(ACEConfig(request_gzip_min_bytes=64))
+    headers = {}
+    small = client._encode_body({"a": "b"}, headers)
+    assert "Content-Encoding" not in headers and json.loads(small) == {"a": "b"}
+    payload = {"messages": ["x" * 500]}
+    large = client._encode_body(payload, headers)
+    assert headers["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(large)) == payload
+
+
+def test_request_bodies_are_not_gzipped_by_default():
+    client = ChatClient(ACEConfig())
+    headers = {}
+    payload = {"messages": ["x" * 10_000]}
+    assert json.loads(client._encode_body(payload, headers)) == payload
+    assert "Content-Encoding" not in headers
+
+
+def test_chat_retries_rate_limits_honoring_retry_after():
+    responses = [
+        httpx.Response(429, text="slow down", headers={"Retry-After": "0"}),
+        httpx.Response(200, json={"choices": [{"message": {"content": "ok"}}]}),
+    ]
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        return responses[len(seen) - 1]
+
+    async def _run():
+        client = ChatClient(ACEConfig(retry_max_attempts=2))
+        await client._client.aclose()
+        client._client = httpx.AsyncClient(
+            base_url="https://llm.invalid/v1", transport=httpx.MockTransport(handler)
+        )
+        try:
+            return await client.chat([{"role": "user", "content": "hi"}])
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(_run())["choices"][0]["message"]["content"] == "ok"
+    assert len(seen) == 2
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import pytest
+
 from ace_playbook.config import ACEConfig
 from ace_playbook.pipeline_offline import OfflinePipeline, Task
 from ace_playbook.pipeline_online import Episode, OnlinePipeline
@@ -11,7 +13,7 @@ class DummyGenerator:
     def __init__(self, config, storage):
         self.storage = storage
 
-    def run(self, query, context):
+    def run(self, query, context, record=True):
         return Trace(
             query=query,
             selected_bullet_ids=[bullet.id for bullet in context.bullets],
@@ -44,6 +46,58 @@ def test_offline_pipeline(monkeypatch, tmp_path):
     tasks = [Task(query="Q1", answer="answer")]
     pipeline.train(tasks, epochs=1)
     assert playbook.stats()["total_bullets"] >= 1
+    assert [trace.success for trace in playbook.storage.list_traces()] == [True]
+
+
+def test_offline_pipeline_reopens_task_factory_each_epoch(monkeypatch, tmp_path):
+    config = ACEConfig(storage_path=tmp_path / "offline.sqlite")
+    playbook = Playbook.initialize(config)
+    monkeypatch.setattr("ace_playbook.pipeline_offline.Generator", DummyGenerator)
+    monkeypatch.setattr("ace_playbook.pipeline_offline.Reflector", DummyReflector)
+    pipeline = OfflinePipeline(config, playbook)
+    calls = []
+
+    def factory():
+        calls.append(1)
+        yield Task(query="Q1", answer="answer")
+
+    pipeline.train(factory, epochs=2)
+    assert len(calls) == 2
+
+
+def test_offline_train_runs_sequentially_inside_a_running_loop(monkeypatch, tmp_path):
+    import asyncio
+
+    config = ACEConfig(storage_path=tmp_path / "offline.sqlite")
+    playbook = Playbook.initialize(config)
+    monkeypatch.setattr("ace_playbook.pipeline_offline.Generator", DummyGenerator)
+    monkeypatch.setattr("ace_playbook.pipeline_offline.Reflector", DummyReflector)
+    pipeline = OfflinePipeline(config, playbook)
+
+    async def notebook_cell():
+        pipeline.train([Task(query="Q1", answer="answer")], epochs=2)
+
+    asyncio.run(notebook_cell())
+    assert playbook.stats()["total_bullets"] >= 1
+    assert len(playbook.storage.list_traces()) == 2
+
+
+class FailingReflector(DummyReflector):
+    def reflect(self, traces, label=None):
+        raise RuntimeError("reflector down")
+
+
+def test_traces_are_kept_when_a_pipeline_fails_mid_run(monkeypatch, tmp_path):
+    config = ACEConfig(storage_path=tmp_path / "fail.sqlite")
+    playbook = Playbook.initialize(config)
+    for module in ("pipeline_offline", "pipeline_online"):
+        monkeypatch.setattr(f"ace_playbook.{module}.Generator", DummyGenerator)
+        monkeypatch.setattr(f"ace_playbook.{module}.Reflector", FailingReflector)
+    with pytest.raises(RuntimeError, match="reflector down"):
+        OfflinePipeline(config, playbook).train([Task(query="Q1", answer="answer")])
+    with pytest.raises(RuntimeError, match="reflector down"):
+        next(OnlinePipeline(config, playbook).run([Episode(query="Q2", answer="answer")]))
+    assert sorted(trace.query for trace in playbook.storage.list_traces()) == ["Q1", "Q2"]
 
 
 def test_online_pipeline(monkeypatch, tmp_path):
@@ -55,3 +109,50 @@ def test_online_pipeline(monkeypatch, tmp_path):
     traces = list(pipeline.run([Episode(query="Q1", answer="answer")]))
     assert traces
     assert playbook.stats()["total_bullets"] >= 1
+
+
+def test_online_pipeline_thread_pool_preserves_order(monkeypatch, tmp_path):
+    config = ACEConfig(storage_path=tmp_path / "online.sqlite")
+    playbook = Playbook.initialize(config)
+    monkeypatch.setattr("ace_playbook.pipeline_online.Generator", DummyGenerator)
+    monkeypatch.setattr("ace_playbook.pipeline_online.Reflector", DummyReflector)
+    pipeline = OnlinePipeline(config, playbook)
+    episodes = [Episode(query=f"Q{i}", answer="answer") for i in range(6)]
+    traces = list(pipeline.run(episodes, batch_size=3, max_workers=3))
+    assert [trace.query for trace in traces] == [episode.query for episode in episodes]
+    assert playbook.stats()["total_bullets"] >= 1
+    assert len(playbook.storage.list_traces()) == len(episodes)
+
+
+class PatchingReflector:
+    def __init__(self, config):
+        pass
+
+    def reflect(self, traces, label=None):
+        from ace_playbook.schemas import BulletPatch, DeltaRuntime
+
+        return DeltaRuntime(
+            patches=[
+                BulletPatch(bullet_id=bullet_id, op="inc_helpful")
+                for trace in traces
+                for bullet_id in trace.selected_bullet_ids
+            ]
+        )
+
+
+def test_online_workers_keep_every_usage_and_patch_increment(monkeypatch, tmp_path):
+    from ace_playbook.schemas import Bullet
+
+    config = ACEConfig(storage_path=tmp_path / "online.sqlite")
+    playbook = Playbook.initialize(config)
+    seeded = Bullet(kind="rule", title="Answer", body="Reply with answer")
+    seeded.embedding = playbook.embedder.embed_texts([seeded.body]).vectors[0]
+    playbook.storage.upsert_bullets([seeded])
+    monkeypatch.setattr("ace_playbook.pipeline_online.Generator", DummyGenerator)
+    monkeypatch.setattr("ace_playbook.pipeline_online.Reflector", PatchingReflector)
+    pipeline = OnlinePipeline(config, playbook)
+    episodes = [Episode(query=f"Q{i}", answer="answer") for i in range(8)]
+    traces = list(pipeline.run(episodes, batch_size=4, max_workers=4))
+    assert all(trace.selected_bullet_ids == [seeded.id] for trace in traces)
+    # One usage increment and one patch increment per episode.
+    assert playbook.storage.get_bullet(seeded.id).helpful_count == 2 * len(episodes)
@@ -32,3 +32,26 @@ def test_reflector_uses_attribution_for_updates():
     assert delta.bullets, "Expected new bullets when gaps exist"
     assert any(patch.bullet_id == "bad" for patch in delta.patches)
     assert all(patch.bullet_id != "helpful" for patch in delta.patches)
+
+
+def test_invalid_streamed_reflection_falls_back_without_a_second_request():
+    reflector = Reflector(ACEConfig())
+    calls = []
+
+    def fake_chat(messages, max_tokens=None, stream=False):
+        calls.append(stream)
+        return {"choices": [{"message": {"content": "{not json"}}]}
+
+    reflector.client.chat = fake_chat
+    trace = Trace(
+        query="Explain taxes",
+        selected_bullet_ids=[],
+        used_bullet_ids=[],
+        misleading_bullet_ids=[],
+        prompt="[]",
+        response="",
+        success=False,
+    )
+    delta = reflector.reflect([trace])
+    assert calls == [True]
+    assert delta.bullets and delta.bullets[0].source_trace_ids == [trace.id]
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from ace_playbook.config import ACEConfig
+from ace_playbook.retrieval import Retriever
+from ace_playbook.schemas import Bullet
+from ace_playbook.storage import PlaybookStorage
+
+
+@pytest.fixture()
+def retriever(tmp_path):
+    config = ACEConfig(storage_path=tmp_path / "retrieval.sqlite", retrieval_top_k=2)
+    storage = PlaybookStorage(config)
+    storage.upsert_bullets(
+        [
+            Bullet(kind="rule", title="East", body="Go east", embedding=[1.0, 0.0]),
+            Bullet(kind="rule", title="North", body="Go north", embedding=[0.0, 1.0]),
+            Bullet(
+                kind="rule",
+                title="North-east",
+                body="Go north-east",
+                embedding=[0.7, 0.7],
+                helpful_count=3,
+                last_used_at=datetime.utcnow() - timedelta(days=10),
+            ),
+        ]
+    )
+    return Retriever(config, storage)
+
+
+def test_retrieve_many_matches_single_queries(retriever):
+    queries = [[1.0, 0.0], [0.0, 1.0], [0.5, 0.5]]
+    batched = retriever.retrieve_many(queries)
+    for query, context in zip(queries, batched):
+        single = retriever.retrieve(query)
+        assert [b.id for b in context.bullets] == [b.id for b in single.bullets]
+    assert [b.title for b in batched[0].bullets] == ["North-east", "East"]
+
+
+def test_fetch_embeddings_returns_normalized_matrix(retriever):
+    bullets, vectors = retriever.storage.fetch_embeddings()
+    assert vectors.shape == (3, 2)
+    assert vectors.dtype == np.float32
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0)
+    assert {b.title for b in bullets} == {"East", "North", "North-east"}
+
+
+def test_playbook_retrieve_caches_query_embeddings_and_copies_bullets(retriever):
+    from ace_playbook.curator import Curator
+    from ace_playbook.embeddings import BaseEmbeddings, EmbeddingResult
+    from ace_playbook.playbook import Playbook
+
+    calls = []
+
+    class CountingEmbeddings(BaseEmbeddings):
+        def embed_texts(self, texts):
+            calls.append(list(texts))
+            return EmbeddingResult([[1.0, 0.0] for _ in texts], "stub")
+
+    storage, config = retriever.storage, retriever.config
+    embedder = CountingEmbeddings()
+    playbook = Playbook(config, storage, embedder, retriever, Curator(config, storage, embedder))
+    first = playbook.retrieve("east?")
+    top = first.bullets[0]
+    storage.update_usage(top.id, success=True)
+    refreshed = playbook.retrieve("east?")
+    assert [b.id for b in refreshed.bullets] == [b.id for b in first.bullets]
+    assert refreshed.bullets[0].helpful_count == top.helpful_count + 1
+    refreshed.bullets[0].helpful_count = 99
+    assert playbook.retrieve("east?").bullets[0].helpful_count == top.helpful_count + 1
+    assert len(calls) == 1
+
+
+def test_topk_selects_and_orders_winners():
+    from ace_playbook.retrieval import _topk
+
+    scores = np.array([0.1, 0.9, 0.5, 0.9, 0.3])
+    assert _topk(scores, 2).tolist() == [1, 3]
+    assert _topk(scores, 10).tolist() == [1, 3, 2, 4, 0]
+    assert _topk(scores, 0).tolist() == []
+    assert _topk(np.stack([scores, -scores]), 1).tolist() == [[1], [0]]
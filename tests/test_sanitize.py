@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import pytest
+
+from ace_playbook.sanitize import contains_forbidden, sanitize_text, validate_bullet_body
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "ignore <<< previous",
+        "end >> here",
+        "token <|im_start|>",
+        "run CURL https://example.com",
+        "Wget http://x",
+        "then rm   -RF /",
+        "SHUTDOWN now",
+        "ſhutdown now",
+        "format C:",
+    ],
+)
+def test_contains_forbidden_flags_patterns(text):
+    assert contains_forbidden(text)
+
+
+def test_contains_forbidden_allows_clean_text():
+    assert not contains_forbidden("Compare bond yields; format the answer as a table.")
+    validate_bullet_body("Discount each cash flow at the yield to maturity.")
+
+
+def test_sanitize_text_strips_control_chars_and_normalizes_fences():
+    assert sanitize_text("a\r\nb\x00c\t```  code") == "a\nbc\t```code"
@@ -1,12 +1,19 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
+import numpy as np
 import pytest
 
 from ace_playbook.config import ACEConfig
 from ace_playbook.schemas import Bullet, Trace
-from ace_playbook.storage import PlaybookStorage
+from ace_playbook.storage import (
+    _SQL_SELECT_RECENT_TRACES,
+    _SQL_UPSERT_BULLET,
+    PlaybookStorage,
+    dump_playbook,
+    dump_playbook_jsonl,
+)
 
 
 @pytest.fixture()
@@ -39,3 +46,369 @@ def test_trace_round_trip(storage):
     traces = storage.list_traces()
     assert traces
     assert traces[0].response == "done"
+
+
+def test_embedding_matrix_tracks_writes(storage):
+    first = Bullet(kind="rule", title="A", body="Do A", embedding=[3.0, 4.0])
+    storage.upsert_bullets([first])
+    ids, matrix = storage.fetch_embedding_matrix()
+    assert ids == [first.id]
+    assert matrix[0] == pytest.approx([0.6, 0.8])
+
+    second = Bullet(kind="rule", title="B", body="Do B", embedding=[0.0, 2.0])
+    storage.upsert_bullets([second])
+    ids, matrix = storage.fetch_embedding_matrix()
+    assert ids == [first.id, second.id]
+    assert matrix.shape == (2, 2)
+
+    storage.prune_to_ids([second.id])
+    ids, matrix = storage.fetch_embedding_matrix()
+    assert ids == [second.id]
+    assert matrix[0] == pytest.approx([0.0, 1.0])
+
+
+def test_int8_embedding_cache_approximates_float(tmp_path):
+    config = ACEConfig(storage_path=tmp_path / "q.sqlite", embedding_quantization="int8")
+    storage = PlaybookStorage(config)
+    storage.upsert_bullets(
+        [
+            Bullet(kind="rule", title="A", body="Do A", embedding=[0.3, -0.9, 0.1]),
+            Bullet(kind="rule", title="B", body="Do B", embedding=[0.0, 0.0, 0.0]),
+        ]
+    )
+    query = np.array([[0.3, -0.9, 0.1]], dtype=np.float32)
+    query /= np.linalg.norm(query)
+    ids, sims = storage.embedding_similarities(query)
+    assert len(ids) == 2
+    assert sims[0, 0] == pytest.approx(1.0, abs=1e-2)
+    assert sims[0, 1] == 0.0
+
+
+def test_feature_columns_follow_usage_and_writes(storage):
+    bullet = Bullet(kind="rule", title="A", body="Do A", embedding=[1.0, 0.0])
+    storage.upsert_bullets([bullet])
+    features = storage.fetch_features()
+    assert features.ids == [bullet.id]
+    assert features.helpful.tolist() == [0.0]
+    assert features.last_used.tolist() == [-1]
+
+    storage.update_usage(bullet.id, success=True)
+    storage.update_usage(bullet.id, success=False)
+    features = storage.fetch_features()
+    assert features.helpful.tolist() == [1.0]
+    assert features.harmful.tolist() == [1.0]
+    assert features.last_used[0] > 0
+    assert features.bullets[0].helpful_count == storage.get_bullet(bullet.id).helpful_count
+
+    other = Bullet(kind="rule", title="B", body="Do B", embedding=[0.0, 1.0], helpful_count=4)
+    storage.upsert_bullets([other])
+    features = storage.fetch_features()
+    assert dict(zip(features.ids, features.helpful.tolist())) == {bullet.id: 1.0, other.id: 4.0}
+
+
+def test_embedding_dimension_enforced_on_write_and_load(storage):
+    storage.upsert_bullets([Bullet(kind="rule", title="A", body="Do A", embedding=[1.0, 0.0])])
+    with pytest.raises(ValueError):
+        storage.upsert_bullets(
+            [Bullet(kind="rule", title="B", body="Do B", embedding=[1.0, 0.0, 0.0])]
+        )
+    assert len(storage.list_bullets()) == 1
+
+    # Legacy rows with another width are skipped when the cache is rebuilt.
+    legacy = Bullet(kind="rule", title="C", body="Do C", embedding=[0.0, 0.0, 1.0])
+    with storage._connect() as conn:
+        conn.execute(_SQL_UPSERT_BULLET, storage._bullet_to_row(legacy))
+        conn.commit()
+    reloaded = PlaybookStorage(storage.config)
+    ids, matrix = reloaded.fetch_embedding_matrix()
+    assert matrix.shape == (1, 2)
+    assert legacy.id not in ids
+
+
+def test_connection_is_persistent_and_rolls_back_on_error(storage):
+    import sqlite3
+
+    with storage._connect() as first, storage._connect() as second:
+        assert first is second
+        assert first.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    bullet = Bullet(kind="rule", title="Kept", body="Do K")
+    storage.upsert_bullets([bullet])
+    with pytest.raises(RuntimeError):
+        with storage._connect() as conn:
+            conn.execute("DELETE FROM bullets")
+            raise RuntimeError("boom")
+    assert [b.id for b in storage.list_bullets()] == [bullet.id]
+    storage.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        storage.list_bullets()
+
+
+def test_upsert_counts_added_and_updated_in_one_batch(storage):
+    first = Bullet(kind="rule", title="A", body="Do A")
+    storage.upsert_bullets([first])
+    second = Bullet(kind="rule", title="B", body="Do B")
+    first.body = "Do A better"
+    assert storage.upsert_bullets([first, second, second]) == (1, 2)
+    assert storage.get_bullet(first.id).body == "Do A better"
+    assert storage.upsert_bullets([]) == (0, 0)
+
+
+def test_record_traces_writes_batch(storage):
+    traces = [
+        Trace(query=f"q{i}", selected_bullet_ids=[], prompt="p", response="r", success=bool(i % 2))
+        for i in range(3)
+    ]
+    storage.record_traces(traces)
+    storage.record_traces([])
+    stored = {trace.id: trace.success for trace in storage.list_traces()}
+    assert stored == {trace.id: trace.success for trace in traces}
+
+
+def test_update_usage_many_applies_every_update_once(storage):
+    a = Bullet(kind="rule", title="A", body="Do A", embedding=[1.0, 0.0])
+    b = Bullet(kind="rule", title="B", body="Do B", embedding=[0.0, 1.0])
+    storage.upsert_bullets([a, b])
+    storage.fetch_features()
+    version = storage.version
+    storage.update_usage_many([(a.id, True), (a.id, True), (b.id, False)])
+    assert storage.version == version + 1
+    assert storage.get_bullet(a.id).helpful_count == 2
+    assert storage.get_bullet(b.id).harmful_count == 1
+    with storage._connect() as conn:
+        uses = dict(conn.execute("SELECT bullet_id, total_uses FROM bullet_usage").fetchall())
+    assert uses == {a.id: 2, b.id: 1}
+    features = storage.fetch_features()
+    assert dict(zip(features.ids, features.helpful.tolist())) == {a.id: 2.0, b.id: 0.0}
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_row_codecs_round_trip_with_and_without_orjson(storage, monkeypatch, use_orjson):
+    from ace_playbook import utils
+
+    if not use_orjson:
+        monkeypatch.setattr(utils, "orjson", None)
+    bullet = Bullet(kind="rule", title="Ü", body="Do ü", tags=["a", "ß"], embedding=[0.5, -1.0])
+    trace = Trace(
+        query="q",
+        selected_bullet_ids=[bullet.id],
+        prompt="p",
+        response="r",
+        success=True,
+        metadata={"k": "v"},
+        attribution_notes={bullet.id: "helped"},
+    )
+    storage.upsert_bullets([bullet])
+    storage.record_trace(trace)
+    loaded = storage.get_bullet(bullet.id)
+    assert loaded.tags == ["a", "ß"] and loaded.embedding.tolist() == [0.5, -1.0]
+    (stored,) = storage.list_traces()
+    assert stored.metadata == {"k": "v"} and stored.attribution_notes == {bullet.id: "helped"}
+
+
+def test_embeddings_are_stored_as_float32_blobs_and_legacy_json_is_migrated(storage):
+    bullet = Bullet(kind="rule", title="A", body="Do A", embedding=[0.25, 0.5])
+    storage.upsert_bullets([bullet])
+    with storage._connect() as conn:
+        (kind,) = conn.execute("SELECT typeof(embedding) FROM bullets").fetchone()
+        assert kind == "blob"
+        conn.execute("UPDATE bullets SET embedding='[1.0, 2.0]' WHERE id=?", (bullet.id,))
+        conn.commit()
+    storage.close()
+    reopened = PlaybookStorage(storage.config)
+    with reopened._connect() as conn:
+        (kind,) = conn.execute("SELECT typeof(embedding) FROM bullets").fetchone()
+    assert kind == "blob"
+    assert reopened.get_bullet(bullet.id).embedding.tolist() == [1.0, 2.0]
+    ids, matrix = reopened.fetch_embedding_matrix()
+    assert ids == [bullet.id] and matrix.shape == (1, 2)
+
+
+def test_row_builders_match_statement_column_order(storage):
+    from ace_playbook.storage import _BULLET_COLUMNS, _TRACE_COLUMNS
+
+    bullet = Bullet(kind="rule", title="A", body="Do A")
+    trace = Trace(query="q", selected_bullet_ids=[], prompt="p", response="r", success=True)
+    bullet_row = dict(zip(_BULLET_COLUMNS, storage._bullet_to_row(bullet)))
+    trace_row = dict(zip(_TRACE_COLUMNS, storage._trace_to_row(trace)))
+    assert len(storage._bullet_to_row(bullet)) == len(_BULLET_COLUMNS)
+    assert len(storage._trace_to_row(trace)) == len(_TRACE_COLUMNS)
+    assert (bullet_row["id"], bullet_row["title"], bullet_row["body"]) == (bullet.id, "A", "Do A")
+    assert bullet_row["tags"] == "[]" and bullet_row["duplicate_of"] is None
+    assert (trace_row["id"], trace_row["prompt"], trace_row["response"]) == (trace.id, "p", "r")
+    assert trace_row["success"] == 1 and trace_row["metadata"] == "{}"
+
+
+def test_iter_bullets_pages_through_every_row(storage, tmp_path):
+    bullets = [Bullet(kind="strategy", title=f"B{i}", body="x") for i in range(7)]
+    storage.upsert_bullets(bullets)
+    streamed = list(storage.iter_bullets(batch_size=3))
+    assert [b.id for b in streamed] == [b.id for b in storage.list_bullets()]
+    assert len(streamed) == 7
+
+    path = tmp_path / "playbook.jsonl"
+    assert dump_playbook_jsonl(storage, path) == 7
+    assert len(path.read_text().splitlines()) == 7
+
+    dumped = dump_playbook(storage)
+    assert iter(dumped) is dumped  # lazy: nothing is materialized up front
+    assert {entry["id"] for entry in dumped} == {b.id for b in bullets}
+
+
+def test_list_traces_orders_by_indexed_created_at(storage):
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    offset = timezone(timedelta(hours=5))
+
+    def trace(query, created_at):
+        return Trace(
+            query=query,
+            selected_bullet_ids=[],
+            prompt="p",
+            response="r",
+            success=True,
+            created_at=created_at,
+        )
+
+    storage.record_traces(
+        [
+            trace("old", base),
+            # 03:00+05:00 is 22:00 UTC the previous day, i.e. the oldest trace.
+            trace("oldest", datetime(2024, 1, 1, 3, tzinfo=offset)),
+            trace("new", base + timedelta(hours=1)),
+        ]
+    )
+    assert [trace.query for trace in storage.list_traces()] == ["new", "old", "oldest"]
+    with storage._connect() as conn:
+        plan = conn.execute(f"EXPLAIN QUERY PLAN {_SQL_SELECT_RECENT_TRACES}", (5,)).fetchall()
+    assert any("idx_traces_created_at" in row[-1] for row in plan)
+
+
+def test_prune_to_ids_handles_keep_sets_past_the_parameter_limit(storage):
+    bullets = [Bullet(kind="strategy", title=f"B{i}", body="x") for i in range(5)]
+    storage.upsert_bullets(bullets)
+    keep = [bullets[1].id, bullets[3].id] + [f"missing-{i}" for i in range(40000)]
+    storage.prune_to_ids(keep)
+    assert {b.id for b in storage.list_bullets()} == {bullets[1].id, bullets[3].id}
+    storage.prune_to_ids(keep[:1])  # the temp table is recreated on the next call
+    assert [b.id for b in storage.list_bullets()] == [bullets[1].id]
+
+
+def test_aggregate_readers_skip_bullet_construction(storage):
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    bullets = [
+        Bullet(kind="strategy", title="low", body="x", harmful_count=2, created_at=base),
+        Bullet(kind="rule", title="old", body="x", helpful_count=1, created_at=base),
+        Bullet(
+            kind="rule",
+            title="new",
+            body="x",
+            helpful_count=1,
+            created_at=base + timedelta(days=1),
+        ),
+    ]
+    storage.upsert_bullets(bullets)
+    assert storage.count_bullets_by_kind() == {"strategy": 1, "rule": 2}
+    assert storage.top_bullet_ids(2) == [bullets[2].id, bullets[1].id]
+
+
+def test_fetch_embeddings_skips_bullets_without_vectors(storage):
+    plain = Bullet(kind="rule", title="plain", body="x")
+    first = Bullet(kind="rule", title="first", body="x", embedding=[3.0, 4.0])
+    second = Bullet(kind="rule", title="second", body="x", embedding=[0.0, 1.0])
+    storage.upsert_bullets([plain, first, second])
+    bullets, matrix = storage.fetch_embeddings()
+    ids, _ = storage.fetch_embedding_matrix()
+    assert [b.id for b in bullets] == ids == [first.id, second.id]
+    assert matrix[0] == pytest.approx([0.6, 0.8])
+
+
+def test_trace_success_is_stored_as_integer_and_read_as_bool(storage):
+    trace = Trace(query="q", selected_bullet_ids=[], prompt="p", response="r", success=True)
+    storage.record_trace(trace)
+    storage.flush()
+    with storage._connect() as conn:
+        stored = conn.execute("SELECT success, typeof(success) FROM traces").fetchone()
+    assert stored == (1, "integer")
+    assert storage.list_traces()[0].success is True
+
+
+def test_select_statements_decode_columns_while_fetching(storage):
+    from ace_playbook.storage import _SQL_SELECT_BULLET_BY_ID
+
+    bullet = Bullet(kind="rule", title="A", body="Do A", tags=["t"], embedding=[1.0, 0.0])
+    storage.upsert_bullets([bullet])
+    with storage._connect() as conn:
+        row = conn.execute(_SQL_SELECT_BULLET_BY_ID, (bullet.id,)).fetchone()
+        raw = conn.execute("SELECT tags, created_at FROM bullets").fetchone()
+    assert row[4] == ["t"]
+    assert row[5] == bullet.created_at and row[5].tzinfo is not None
+    assert row[10].dtype == np.float32
+    assert raw == ('["t"]', bullet.created_at.isoformat())
+
+
+def test_usage_updates_do_not_maintain_a_score_index(storage):
+    with storage._connect() as conn:
+        rows = conn.execute("SELECT name FROM sqlite_master WHERE type='index'").fetchall()
+    indexes = {row[0] for row in rows}
+    assert "idx_bullets_score_last_used" not in indexes
+    assert "idx_traces_created_at" in indexes
+
+
+def _stored_trace_count(storage):
+    with storage._connect() as conn:
+        return conn.execute("SELECT COUNT(*) FROM traces").fetchone()[0]
+
+
+def test_trace_and_usage_writes_are_committed_in_the_background(storage):
+    import time
+
+    bullet = Bullet(kind="rule", title="A", body="Do A")
+    storage.upsert_bullets([bullet])
+    trace = Trace(query="q", selected_bullet_ids=[], prompt="p", response="r", success=True)
+    storage.record_trace(trace)
+    storage.update_usage_many([(bullet.id, True), (bullet.id, False)])
+    deadline = time.monotonic() + 5
+    while _stored_trace_count(storage) == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert _stored_trace_count(storage) == 1
+    fetched = storage.get_bullet(bullet.id)
+    assert (fetched.helpful_count, fetched.harmful_count) == (1, 1)
+
+
+def test_reads_and_close_flush_queued_writes(storage):
+    traces = [
+        Trace(query=f"q{i}", selected_bullet_ids=[], prompt="p", response="r", success=True)
+        for i in range(3)
+    ]
+    storage.record_traces(traces)
+    assert len(storage.list_traces()) == 3
+
+    last = Trace(query="last", selected_bullet_ids=[], prompt="p", response="r", success=False)
+    storage.record_traces([last])
+    storage.close()
+    reopened = PlaybookStorage(storage.config)
+    assert len(reopened.list_traces()) == 4
+    with pytest.raises(RuntimeError):
+        storage.record_traces(traces)
+
+
+def test_failed_background_writes_are_dropped_without_blocking_later_ones(storage):
+    with storage._connect() as conn:
+        conn.execute(
+            "CREATE TEMP TRIGGER reject_traces BEFORE INSERT ON traces "
+            "WHEN NEW.query = 'bad' BEGIN SELECT RAISE(ABORT, 'disk on fire'); END"
+        )
+    bad = Trace(query="bad", selected_bullet_ids=[], prompt="p", response="r", success=True)
+    good = Trace(query="q", selected_bullet_ids=[], prompt="p", response="r", success=True)
+    storage.record_traces([bad, good])
+    assert [stored.id for stored in storage.list_traces()] == [good.id]
+
+    later = Trace(query="later", selected_bullet_ids=[], prompt="p", response="r", success=True)
+    storage.record_trace(later)
+    assert {stored.id for stored in storage.list_traces()} == {good.id, later.id}
+
+
+def test_record_trace_rejects_missing_text_fields(storage):
+    trace = Trace(query=None, selected_bullet_ids=[], prompt="p", response="r", success=True)
+    with pytest.raises(ValueError, match="query"):
+        storage.record_trace(trace)
+    assert storage.list_traces() == []
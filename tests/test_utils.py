@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import json
+
+from ace_playbook import utils
+from ace_playbook.schemas import Trace
+
+
+def test_json_dumps_serializes_dataclasses_like_to_dict(monkeypatch):
+    trace = Trace(
+        query="q",
+        selected_bullet_ids=["a"],
+        prompt="p",
+        response="r",
+        success=True,
+        metadata={"k": "v"},
+    )
+    expected = {"traces": [trace.to_dict()]}
+    assert json.loads(utils.json_dumps({"traces": [trace]})) == expected
+    monkeypatch.setattr(utils, "orjson", None)
+    assert json.loads(utils.json_dumps({"traces": [trace]})) == expected
+
+
+def test_json_dumps_pretty_matches_stdlib_indentation(monkeypatch, tmp_path):
+    from ace_playbook.schemas import export_delta_json_schema
+
+    payload = {"a": [1, 2], "b": "é"}
+    expected = json.dumps(payload, indent=2, ensure_ascii=False).encode("utf-8")
+    assert utils.json_dumps_pretty(payload) == expected
+    monkeypatch.setattr(utils, "orjson", None)
+    assert utils.json_dumps_pretty(payload) == expected
+    schema = export_delta_json_schema(str(tmp_path / "delta.json"))
+    assert json.loads((tmp_path / "delta.json").read_text(encoding="utf-8")) == schema
+
+
+def test_dump_jsonl_writes_one_object_per_line(monkeypatch, tmp_path):
+    monkeypatch.setattr(utils, "_JSONL_CHUNK_BYTES", 64)
+    items = [{"id": i, "text": "é" * i} for i in range(50)]
+    for backend in (utils.orjson, None):
+        monkeypatch.setattr(utils, "orjson", backend)
+        path = tmp_path / "out.jsonl"
+        utils.dump_jsonl(path, iter(items))
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line) for line in lines] == items